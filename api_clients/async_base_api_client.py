@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import time
+from config import REQUEST_TIMEOUTS, MAX_RETRIES, RETRY_BACKOFF_FACTOR, USE_CACHING, HTTP_POOL_SIZE
+from utils.concurrency_controller import get_concurrency_controller, parse_retry_after
+from utils.rate_limiter import get_rate_limiter
+from utils.request_cache import get_request_cache
+from utils.single_flight import AsyncSingleFlight
+from api_clients.base_api_client import BaseApiClient
+
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+
+class AsyncBaseApiClient:
+    """asyncio counterpart of ``BaseApiClient`` built on aiohttp.
+
+    Requests go through the same response cache, token buckets and adaptive
+    concurrency limits as the threaded clients, but waiting for a slot or a
+    token suspends the coroutine instead of blocking a thread. The cache is
+    synchronous (SQLite or JSON files), so it is always called from a worker
+    thread to keep the event loop free. Use the client
+    as an async context manager, or call ``close()``, to release its session.
+    """
+
+    def __init__(self):
+        if not HAS_AIOHTTP:
+            raise ImportError("The async API clients need aiohttp (pip install aiohttp)")
+        self.rate_limiter = get_rate_limiter()
+        self.concurrency = get_concurrency_controller()
+        self.cache = get_request_cache() if USE_CACHING else None
+        self.single_flight = AsyncSingleFlight()
+        self._session = None
+
+    # Cache and request-identity logic does no I/O and is shared with the threaded client
+    _request_key = BaseApiClient._request_key
+    _lookup_wider = BaseApiClient._lookup_wider
+    _conditional_headers = BaseApiClient._conditional_headers
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _get_session(self):
+        # Created lazily so the session belongs to the running event loop
+        if self._session is None or self._session.closed:
+            connect_timeout, read_timeout = REQUEST_TIMEOUTS
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=HTTP_POOL_SIZE),
+                timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout),
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def make_request(self, url, params=None, headers=None, method='GET', citations=None,
+                           api_name=None, rate_limit=0, response_format='json', use_cache=True, profile=None):
+        """Async ``BaseApiClient.make_request``; same arguments and return values."""
+        if profile is not None:
+            params = profile.to_params(params)
+        key = self._request_key(url, params, method, citations, response_format)
+        return await self.single_flight.do(
+            key, lambda: self._make_request(url, params, headers, method, citations,
+                                            api_name, rate_limit, response_format, use_cache, profile))
+
+    async def _make_request(self, url, params, headers, method, citations, api_name, rate_limit, response_format,
+                            use_cache, profile):
+        cache = self.cache if use_cache and method == 'GET' else None
+        cached_entry = None
+        if cache:
+            cached_entry = await asyncio.to_thread(cache.lookup, url, params)
+            if cached_entry is not None and cache.is_fresh(cached_entry, api_name):
+                return cached_entry.data
+            if profile is not None:
+                wider_data = await asyncio.to_thread(self._lookup_wider, url, params, profile, api_name)
+                if wider_data is not None:
+                    return wider_data
+            if cached_entry is not None and not cached_entry.is_negative:
+                headers = self._conditional_headers(headers, cached_entry)
+
+        retries = 0
+        while retries <= MAX_RETRIES:
+            try:
+                status, response_headers, data = await self._send(method, url, params, headers, citations,
+                                                                  api_name, rate_limit, response_format)
+
+                if status == 200:
+                    if cache:
+                        await asyncio.to_thread(cache.set, url, params, data, etag=response_headers.get('ETag'),
+                                                last_modified=response_headers.get('Last-Modified'))
+                    return data
+                elif status == 304 and cached_entry is not None:
+                    await asyncio.to_thread(cache.touch, url, params)
+                    return cached_entry.data
+                elif status == 404:
+                    logging.warning(f"Resource not found (404): {url}")
+                    if cache:
+                        await asyncio.to_thread(cache.set_negative, url, params)
+                    return None
+                elif status == 429:
+                    retry_after = parse_retry_after(response_headers.get('Retry-After'))
+                    wait_time = retry_after if retry_after is not None else RETRY_BACKOFF_FACTOR * (retries + 2) * 2
+                    logging.warning(f"Rate limit exceeded (429). Waiting {wait_time}s...")
+                    await self._pause(api_name, wait_time)
+                else:
+                    logging.error(f"Error {status}: {data}")
+                    retry_after = parse_retry_after(response_headers.get('Retry-After'))
+                    if status == 503 and retry_after:
+                        await self._pause(api_name, retry_after)
+            except asyncio.TimeoutError:
+                logging.warning(f"Request timeout for {url}. Retrying...")
+            except aiohttp.ClientError as e:
+                logging.error(f"Request error: {e}. Retrying...")
+
+            retries += 1
+            if retries <= MAX_RETRIES:
+                await asyncio.sleep(RETRY_BACKOFF_FACTOR * retries)
+
+        logging.error(f"Failed to retrieve data from {url} after {MAX_RETRIES} retries.")
+        return None
+
+    async def _send(self, method, url, params, headers, citations, api_name, rate_limit, response_format):
+        """Send one request inside the API's limits.
+
+        Returns:
+            Tuple of (status, headers, body); only 200 bodies are decoded as JSON
+        """
+        limiter = self.concurrency.get_limiter(api_name)
+        if limiter:
+            await limiter.acquire_async()
+        status = None
+        start = time.monotonic()
+        try:
+            if api_name:
+                delay = self.rate_limiter.reserve(api_name, rate_limit)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            start = time.monotonic()
+            json_body = {"ids": citations} if method == "POST" else None
+            async with self._get_session().request(method, url, params=params, headers=headers,
+                                                   json=json_body) as response:
+                status = response.status
+                if status == 200 and response_format == 'json':
+                    data = await response.json(content_type=None)
+                else:
+                    data = await response.text()
+                return status, response.headers, data
+        finally:
+            if limiter:
+                limiter.release(time.monotonic() - start, status)
+
+    async def _pause(self, api_name, seconds):
+        """Back off before the next attempt, holding back the whole API if adaptive."""
+        limiter = self.concurrency.get_limiter(api_name)
+        if limiter:
+            limiter.pause(seconds)
+        else:
+            await asyncio.sleep(seconds)
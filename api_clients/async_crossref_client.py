@@ -0,0 +1,24 @@
+from api_clients.async_base_api_client import AsyncBaseApiClient
+from api_clients.crossref_client import CrossRefClient
+from config import CROSSREF_RATE_LIMIT
+
+
+class AsyncCrossRefClient(AsyncBaseApiClient, CrossRefClient):
+    """``CrossRefClient`` whose network methods are coroutines."""
+
+    def __init__(self):
+        AsyncBaseApiClient.__init__(self)
+
+    async def request_by_doi(self, doi):
+        if not doi:
+            return None
+
+        url = f"{self.CROSSREF_API_URL}/{doi}"
+        return await self.make_request(url, api_name='crossref', rate_limit=CROSSREF_RATE_LIMIT)
+
+    async def get_institutions_by_doi(self, doi, dblp_author_names):
+        if not doi or not dblp_author_names:
+            return None
+
+        response = await self.request_by_doi(doi)
+        return self._institutions_from_work(response, dblp_author_names)
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+from api_clients.async_base_api_client import AsyncBaseApiClient
+from api_clients.openalex_client import OpenAlexClient
+from api_clients.field_profiles import OPENALEX_FULL, OPENALEX_AUTHORS, get_profile
+from config import OPENALEX_API_URL, OPENALEX_RATE_LIMIT
+from utils.author_institution_store import get_author_institution_store
+from utils.openalex_snapshot import get_openalex_snapshot_index
+
+
+class AsyncOpenAlexClient(AsyncBaseApiClient, OpenAlexClient):
+    """``OpenAlexClient`` whose network methods are coroutines.
+
+    Parsing and matching helpers are inherited unchanged; batches of DOIs or
+    authors are requested concurrently instead of one after the other. Helpers
+    that read or write the cache, the snapshot index or the author map run in
+    a worker thread.
+    """
+
+    def __init__(self, stage=None):
+        AsyncBaseApiClient.__init__(self)
+        self.profile = get_profile('openalex', stage) or OPENALEX_FULL
+        self.author_store = get_author_institution_store()
+        self.snapshot = get_openalex_snapshot_index()
+
+    async def request_by_work_id(self, work_id):
+        url = f"{OPENALEX_API_URL}/{work_id}"
+        return await self.make_request(url, api_name='openalex', rate_limit=OPENALEX_RATE_LIMIT, profile=self.profile)
+
+    async def request_by_doi(self, doi):
+        if not doi:
+            return None
+        work = (await asyncio.to_thread(self._snapshot_works, [doi])).get(doi)
+        if work is not None:
+            return work
+        return await self.make_request(self._doi_url(doi), api_name='openalex', rate_limit=OPENALEX_RATE_LIMIT,
+                                       profile=self.profile)
+
+    async def request_by_dois(self, dois):
+        """Async ``OpenAlexClient.request_by_dois``."""
+        results, unbatchable, batches = await asyncio.to_thread(self._plan_doi_batches, list(dois))
+        works = await asyncio.gather(*(self.request_by_doi(doi) for doi in unbatchable))
+        results.update(zip(unbatchable, works))
+
+        responses = await asyncio.gather(*(
+            self.make_request(OPENALEX_API_URL, params=self._doi_batch_params(chunk), api_name='openalex',
+                              rate_limit=OPENALEX_RATE_LIMIT, use_cache=False, profile=self.profile)
+            for chunk in batches))
+        for chunk, response in zip(batches, responses):
+            await asyncio.to_thread(self._store_doi_batch, chunk, response, results)
+        return self._share_doi_variants(results)
+
+    async def harvest_venue(self, source_ids, first_year, last_year):
+        """Async ``OpenAlexClient.harvest_venue``; cursor pages are inherently sequential."""
+        params = self._harvest_params(source_ids, first_year, last_year)
+        works = await asyncio.to_thread(self._cached_harvest, params)
+        if works is not None:
+            return works
+
+        works = []
+        cursor = '*'
+        while cursor:
+            response = await self.make_request(OPENALEX_API_URL, params={**params, 'cursor': cursor},
+                                               api_name='openalex', rate_limit=OPENALEX_RATE_LIMIT, use_cache=False,
+                                               profile=self.profile)
+            if response is None:
+                return works
+            cursor = await asyncio.to_thread(self._store_harvest_page, response, works)
+        await asyncio.to_thread(self._cache_harvest, params, works)
+        return works
+
+    async def get_referenced_works(self, doi=None, work_id=None):
+        response = None
+        if doi:
+            response = await self.request_by_doi(doi)
+        elif work_id:
+            response = await self.request_by_work_id(work_id)
+
+        if response and "referenced_works" in response:
+            return response["referenced_works"]
+        return None
+
+    async def get_paper_authors_and_affiliations_doi(self, doi, use_author_fallback=True):
+        work = await self.request_by_doi(doi)
+        return await self.get_authors_and_affiliations_from_work(work, use_author_fallback)
+
+    async def get_authors_and_affiliations_from_work(self, work, use_author_fallback=True, author_institutions=None):
+        if work is not None and use_author_fallback and author_institutions is None:
+            author_institutions = await self.prefetch_author_institutions([work])
+        # Every fallback author is in the map now, so the parent never has to fetch
+        return OpenAlexClient.get_authors_and_affiliations_from_work(self, work, use_author_fallback,
+                                                                     author_institutions)
+
+    async def _get_author_last_institution(self, author_id):
+        institutions = await self.get_authors_last_institutions([author_id])
+        return institutions.get(self._author_code(author_id))
+
+    async def get_authors_last_institutions(self, author_ids):
+        """Async ``OpenAlexClient.get_authors_last_institutions``."""
+        codes, institutions, batches = await asyncio.to_thread(self._plan_author_batches, list(author_ids))
+        responses = await asyncio.gather(*(
+            self.make_request(self.OPENALEX_AUTHORS_URL, params=self._author_batch_params(chunk),
+                              api_name='openalex', rate_limit=OPENALEX_RATE_LIMIT, use_cache=False,
+                              profile=OPENALEX_AUTHORS)
+            for chunk in batches), return_exceptions=True)
+        for chunk, response in zip(batches, responses):
+            if isinstance(response, Exception):
+                logging.debug(f"Could not get author institutions for {chunk}: {response}")
+                continue
+            await asyncio.to_thread(self._store_author_batch, chunk, response, institutions)
+
+        return {code: institutions.get(code) for code in codes}
+
+    async def prefetch_author_institutions(self, works):
+        return await self.get_authors_last_institutions(self._fallback_author_ids(works))
+
+    async def search_by_title(self, title, author_names=None):
+        if not title:
+            return None
+
+        response = await self.make_request(OPENALEX_API_URL, params=self._title_search_params(title),
+                                           api_name='openalex', rate_limit=OPENALEX_RATE_LIMIT, profile=self.profile)
+        return self._first_result(response)
+
+    async def get_institutions_by_title(self, title, dblp_author_names):
+        if not dblp_author_names:
+            return None
+
+        response = await self.search_by_title(title, dblp_author_names)
+        return self._institutions_from_match(response, dblp_author_names)
@@ -0,0 +1,74 @@
+import asyncio
+from api_clients.async_base_api_client import AsyncBaseApiClient
+from api_clients.semantic_scholar_client import SemanticScholarClient
+from api_clients.field_profiles import get_profile, S2_EXTENDED, S2_CITATIONS, S2_CITING_PAPERS
+from config import (SEMANTIC_SCHOLAR_API_KEY, SEMANTIC_SCHOLAR_API_URL,
+                    USE_SEMANTIC_SCHOLAR_API_KEYS, SEMANTIC_SCHOLAR_RATE_LIMIT, MAX_CITATIONS_PER_PAPER)
+
+
+class AsyncSemanticScholarClient(AsyncBaseApiClient, SemanticScholarClient):
+    """``SemanticScholarClient`` whose network methods are coroutines.
+
+    Helpers that read or write the cache or the citation checkpoints run in a
+    worker thread.
+    """
+
+    def __init__(self, stage=None):
+        AsyncBaseApiClient.__init__(self)
+        self.profile = get_profile('semantic_scholar', stage)
+
+    async def request_by_doi(self, doi):
+        if not doi:
+            return None
+        url = f"{SEMANTIC_SCHOLAR_API_URL}/{doi}"
+        headers = {"x-api-key": SEMANTIC_SCHOLAR_API_KEY} if USE_SEMANTIC_SCHOLAR_API_KEYS else None
+        return await self.make_request(url, headers=headers, profile=self.profile or S2_EXTENDED,
+                                       api_name='semantic_scholar', rate_limit=SEMANTIC_SCHOLAR_RATE_LIMIT)
+
+    async def batch_request(self, citations):
+        records = await self.batch_by_ids(citations)
+        return [records[paper_id] for paper_id in citations if paper_id in records]
+
+    async def batch_by_dois(self, dois):
+        return await self._cached_batch(dois, self.profile or S2_EXTENDED, id_prefix="DOI:")
+
+    async def batch_by_ids(self, paper_ids):
+        return await self._cached_batch(paper_ids, self.profile or S2_CITATIONS)
+
+    async def _cached_batch(self, ids, profile, id_prefix=""):
+        results, batches = await asyncio.to_thread(self._plan_batches, list(ids), profile)
+        # The token bucket still spaces the batches out; they just do not hold a thread while waiting
+        responses = await asyncio.gather(*(self._post_batch([id_prefix + i for i in chunk], profile)
+                                           for chunk in batches))
+        for chunk, response in zip(batches, responses):
+            await asyncio.to_thread(self._store_batch, chunk, response, profile, results)
+        return results
+
+    async def _post_batch(self, ids, profile):
+        url = f"{SEMANTIC_SCHOLAR_API_URL}/batch"
+        headers = {"x-api-key": SEMANTIC_SCHOLAR_API_KEY} if USE_SEMANTIC_SCHOLAR_API_KEYS else None
+        return await self.make_request(url, method='POST', profile=profile, citations=ids, headers=headers,
+                                       api_name='semantic_scholar', rate_limit=SEMANTIC_SCHOLAR_RATE_LIMIT,
+                                       use_cache=False)
+
+    async def get_all_citations(self, paper_id, citation_count, on_page, max_citations=MAX_CITATIONS_PER_PAPER,
+                                checkpoints=None):
+        """Async ``SemanticScholarClient.get_all_citations``; pages are handed on as they complete."""
+        fetched, offsets = await asyncio.to_thread(self._plan_citation_pages, paper_id, citation_count,
+                                                   max_citations, checkpoints, on_page)
+        for request in asyncio.as_completed([self._get_citations_page_at(paper_id, offset, limit)
+                                             for offset, limit in offsets]):
+            offset, response = await request
+            await asyncio.to_thread(self._store_citations_page, paper_id, offset, response, fetched, checkpoints,
+                                    on_page)
+        return self._all_pages_fetched(paper_id, fetched, offsets)
+
+    async def _get_citations_page_at(self, paper_id, offset, limit):
+        return offset, await self._get_citations_page(paper_id, offset, limit)
+
+    async def _get_citations_page(self, paper_id, offset, limit):
+        url = f"{SEMANTIC_SCHOLAR_API_URL}/{paper_id}/citations"
+        headers = {"x-api-key": SEMANTIC_SCHOLAR_API_KEY} if USE_SEMANTIC_SCHOLAR_API_KEYS else None
+        return await self.make_request(url, params={'offset': offset, 'limit': limit}, headers=headers,
+                                       profile=S2_CITING_PAPERS, api_name='semantic_scholar',
+                                       rate_limit=SEMANTIC_SCHOLAR_RATE_LIMIT, use_cache=False)
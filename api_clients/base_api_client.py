@@ -1,18 +1,26 @@
 import requests
+import json
 import logging
 import time
-from config import REQUEST_TIMEOUT, MAX_RETRIES, RETRY_BACKOFF_FACTOR, USE_CACHING
+from config import REQUEST_TIMEOUTS, MAX_RETRIES, RETRY_BACKOFF_FACTOR, USE_CACHING
+from utils.concurrency_controller import get_concurrency_controller, parse_retry_after
+from utils.http_session import get_session_pool
 from utils.rate_limiter import get_rate_limiter
 from utils.request_cache import get_request_cache
+from utils.single_flight import get_single_flight
+from api_clients.field_profiles import wider_profiles
 
 
 class BaseApiClient:
     def __init__(self):
         self.rate_limiter = get_rate_limiter()
+        self.session_pool = get_session_pool()
+        self.concurrency = get_concurrency_controller()
         self.cache = get_request_cache() if USE_CACHING else None
+        self.single_flight = get_single_flight()
 
     def make_request(self, url, params=None, headers=None, method='GET', citations=None, 
-                     api_name=None, rate_limit=0):
+                     api_name=None, rate_limit=0, response_format='json', use_cache=True, profile=None):
         """Make an HTTP request with retries, backoff, rate limiting, and caching.
         
         Args:
@@ -21,44 +29,76 @@ class BaseApiClient:
             headers: Request headers
             method: HTTP method ('GET' or 'POST')
             citations: Citations data for batch POST requests
-            api_name: Name of the API for rate limiting
-            rate_limit: Delay between requests in seconds
+            api_name: Name of the API for rate limiting and connection pooling
+            rate_limit: Fallback delay between requests in seconds, used only
+                        when no token bucket is configured for api_name
+            response_format: 'json' to decode the body, 'text' to return it as is
+            use_cache: False for batch requests whose results the caller caches per item
+            profile: FieldProfile whose projection parameter is added to params
+        
+        Concurrent calls for the same request share a single network call.
         """
+        if profile is not None:
+            params = profile.to_params(params)
+        key = self._request_key(url, params, method, citations, response_format)
+        return self.single_flight.do(
+            key, lambda: self._make_request(url, params, headers, method, citations,
+                                            api_name, rate_limit, response_format, use_cache, profile))
+
+    def _request_key(self, url, params, method, citations, response_format):
+        """Canonical identity of a request, independent of dict ordering and headers."""
+        return (method, url, json.dumps(params, sort_keys=True) if params else '',
+                json.dumps(citations) if citations else '', response_format)
+
+    def _make_request(self, url, params, headers, method, citations, api_name, rate_limit, response_format,
+                      use_cache, profile):
+        cache = self.cache if use_cache and method == 'GET' else None
         # Check cache first (only for GET requests)
-        if method == 'GET' and self.cache:
-            cached_response = self.cache.get(url, params)
-            if cached_response is not None:
-                return cached_response
+        cached_entry = None
+        if cache:
+            cached_entry = cache.lookup(url, params)
+            if cached_entry is not None and cache.is_fresh(cached_entry, api_name):
+                return cached_entry.data
+            if profile is not None:
+                wider_data = self._lookup_wider(url, params, profile, api_name)
+                if wider_data is not None:
+                    return wider_data
+            if cached_entry is not None and not cached_entry.is_negative:
+                # Stale: ask the server whether our copy is still current
+                headers = self._conditional_headers(headers, cached_entry)
         
+        session = self.session_pool.get_session(api_name)
         retries = 0
         while retries <= MAX_RETRIES:
             try:
-                # Apply rate limiting if specified
-                if api_name and rate_limit > 0:
-                    self.rate_limiter.wait_if_needed(api_name, rate_limit)
-                
-                if method == "GET":
-                    response = requests.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
-                elif method == "POST":
-                    response = requests.post(url, params=params, json={"ids": citations}, 
-                                           headers=headers, timeout=REQUEST_TIMEOUT)
+                response = self._send(session, method, url, params, headers, citations, api_name, rate_limit)
                 
                 if response.status_code == 200:
-                    data = response.json()
+                    data = response.json() if response_format == 'json' else response.text
                     # Cache successful GET requests
-                    if method == 'GET' and self.cache:
-                        self.cache.set(url, params, data)
+                    if cache:
+                        cache.set(url, params, data, etag=response.headers.get('ETag'),
+                                       last_modified=response.headers.get('Last-Modified'))
                     return data
+                elif response.status_code == 304 and cached_entry is not None:
+                    cache.touch(url, params)
+                    return cached_entry.data
                 elif response.status_code == 404:
                     logging.warning(f"Resource not found (404): {url}")
+                    if cache:
+                        cache.set_negative(url, params)
                     return None
                 elif response.status_code == 429:
-                    # Rate limit exceeded, wait longer
-                    wait_time = RETRY_BACKOFF_FACTOR * (retries + 2) * 2
+                    # Rate limit exceeded, wait as long as the server asks
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    wait_time = retry_after if retry_after is not None else RETRY_BACKOFF_FACTOR * (retries + 2) * 2
                     logging.warning(f"Rate limit exceeded (429). Waiting {wait_time}s...")
-                    time.sleep(wait_time)
+                    self._pause(api_name, wait_time)
                 else:
                     logging.error(f"Error {response.status_code}: {response.text}")
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    if response.status_code == 503 and retry_after:
+                        self._pause(api_name, retry_after)
             except requests.exceptions.Timeout:
                 logging.warning(f"Request timeout for {url}. Retrying...")
             except requests.exceptions.RequestException as e:
@@ -69,4 +109,57 @@ class BaseApiClient:
                 time.sleep(RETRY_BACKOFF_FACTOR * retries)
         
         logging.error(f"Failed to retrieve data from {url} after {MAX_RETRIES} retries.")
-        return None
\ No newline at end of file
+        return None
+
+    def _lookup_wider(self, url, params, profile, api_name):
+        """Serve a profiled request from a fresh cached response of a wider profile."""
+        if self.cache is None:
+            return None
+        base_params = {k: v for k, v in (params or {}).items() if k != profile.param}
+        for wider in wider_profiles(profile):
+            data = self.cache.get(url, wider.to_params(base_params), api_name)
+            if data is not None:
+                return profile.project(data)
+        return None
+
+    def _conditional_headers(self, headers, cached_entry):
+        """Add If-None-Match/If-Modified-Since validators from a stale cache entry."""
+        if not cached_entry.etag and not cached_entry.last_modified:
+            return headers
+        headers = dict(headers) if headers else {}
+        if cached_entry.etag:
+            headers['If-None-Match'] = cached_entry.etag
+        if cached_entry.last_modified:
+            headers['If-Modified-Since'] = cached_entry.last_modified
+        return headers
+
+    def _send(self, session, method, url, params, headers, citations, api_name, rate_limit):
+        """Send one HTTP request inside the API's concurrency and rate limits."""
+        limiter = self.concurrency.get_limiter(api_name)
+        if limiter:
+            limiter.acquire()
+        status = None
+        start = time.monotonic()
+        try:
+            # Apply rate limiting if specified
+            if api_name:
+                self.rate_limiter.acquire(api_name, rate_limit)
+            start = time.monotonic()
+            if method == "GET":
+                response = session.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUTS)
+            elif method == "POST":
+                response = session.post(url, params=params, json={"ids": citations}, 
+                                      headers=headers, timeout=REQUEST_TIMEOUTS)
+            status = response.status_code
+            return response
+        finally:
+            if limiter:
+                limiter.release(time.monotonic() - start, status)
+
+    def _pause(self, api_name, seconds):
+        """Back off before the next attempt, holding back the whole API if adaptive."""
+        limiter = self.concurrency.get_limiter(api_name)
+        if limiter:
+            limiter.pause(seconds)
+        else:
+            time.sleep(seconds)
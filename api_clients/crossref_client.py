@@ -1,4 +1,5 @@
 from api_clients.base_api_client import BaseApiClient
+from config import CROSSREF_RATE_LIMIT
 import logging
 
 
@@ -14,14 +15,16 @@ class CrossRefClient(BaseApiClient):
             return None
         
         url = f"{self.CROSSREF_API_URL}/{doi}"
-        return self.make_request(url, api_name='crossref', rate_limit=0.1)
+        return self.make_request(url, api_name='crossref', rate_limit=CROSSREF_RATE_LIMIT)
     
     def get_institutions_by_doi(self, doi, dblp_author_names):
         if not doi or not dblp_author_names:
             return None
         
-        response = self.request_by_doi(doi)
-        
+        return self._institutions_from_work(self.request_by_doi(doi), dblp_author_names)
+    
+    def _institutions_from_work(self, response, dblp_author_names):
+        """Institutions of a CrossRef work, aligned with the DBLP authors."""
         if not response or 'message' not in response:
             return None
         
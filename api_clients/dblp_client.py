@@ -0,0 +1,15 @@
+from api_clients.base_api_client import BaseApiClient
+
+
+class DblpClient(BaseApiClient):
+
+    def __init__(self):
+        super().__init__()
+
+    def get_page(self, url):
+        """Fetch a DBLP page as text.
+
+        Pages are cached under the 'dblp' TTL and revalidated with
+        ETag/Last-Modified once stale, so an unchanged index costs a 304.
+        """
+        return self.make_request(url, api_name='dblp', response_format='text')
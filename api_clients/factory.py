@@ -1,15 +1,34 @@
 from api_clients.semantic_scholar_client import SemanticScholarClient
 from api_clients.openalex_client import OpenAlexClient
 from api_clients.crossref_client import CrossRefClient
+from api_clients.dblp_client import DblpClient
+from api_clients.async_semantic_scholar_client import AsyncSemanticScholarClient
+from api_clients.async_openalex_client import AsyncOpenAlexClient
+from api_clients.async_crossref_client import AsyncCrossRefClient
 
 class APIFactory:
     @staticmethod
-    def get_client(api_name):
+    def get_client(api_name, stage=None):
+        """Create a client; ``stage`` selects the crawler stage's field profile."""
         if api_name == 'semantic_scholar':
-            return SemanticScholarClient()
+            return SemanticScholarClient(stage)
         elif api_name == 'openalex':
-            return OpenAlexClient()
+            return OpenAlexClient(stage)
         elif api_name == 'crossref':
             return CrossRefClient()
+        elif api_name == 'dblp':
+            return DblpClient()
         else:
-            raise ValueError('Invalid API name')
\ No newline at end of file
+            raise ValueError('Invalid API name')
+
+    @staticmethod
+    def get_async_client(api_name, stage=None):
+        """Create the asyncio variant of a client (requires aiohttp)."""
+        if api_name == 'semantic_scholar':
+            return AsyncSemanticScholarClient(stage)
+        elif api_name == 'openalex':
+            return AsyncOpenAlexClient(stage)
+        elif api_name == 'crossref':
+            return AsyncCrossRefClient()
+        else:
+            raise ValueError('Invalid API name')
@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+from typing import Tuple
+
+
+@dataclass(frozen=True)
+class FieldProfile:
+    """Set of response fields a crawler stage needs from one API.
+
+    Turned into OpenAlex ``select=`` or Semantic Scholar ``fields=``. A profile
+    without fields asks for the full object.
+    """
+    api_name: str
+    name: str
+    fields: Tuple[str, ...] = ()
+
+    # Semantic Scholar always returns paperId, whatever was asked for
+    ALWAYS_RETURNED = ("paperId",)
+    # Keys under which list endpoints return their objects (OpenAlex, Semantic Scholar)
+    LIST_WRAPPERS = ("results", "data")
+
+    @property
+    def param(self):
+        return 'select' if self.api_name == 'openalex' else 'fields'
+
+    def to_params(self, params=None):
+        """Return ``params`` extended with this profile's projection parameter."""
+        params = dict(params) if params else {}
+        if self.fields:
+            params[self.param] = ",".join(self.fields)
+        return params
+
+    def covers(self, other):
+        """True if a response for this profile contains everything ``other`` needs."""
+        if not self.fields:
+            return True
+        if not other.fields:
+            return False
+        return set(self.fields) >= set(other.fields)
+
+    def project(self, data):
+        """Trim a response fetched with a wider profile down to this profile.
+
+        The objects of a list response (e.g. a search's ``results``) are trimmed
+        one by one and the wrapper (``meta``, paging) is kept as is.
+        """
+        if not self.fields:
+            return data
+        if isinstance(data, list):
+            return [self.project(item) for item in data]
+        if not isinstance(data, dict):
+            return data
+        for wrapper in self.LIST_WRAPPERS:
+            if isinstance(data.get(wrapper), list):
+                return {**data, wrapper: self.project(data[wrapper])}
+        roots = {field.split(".")[0] for field in self.fields} | set(self.ALWAYS_RETURNED)
+        return {key: value for key, value in data.items() if key in roots}
+
+
+OPENALEX_FULL = FieldProfile('openalex', 'full')
+OPENALEX_BASE = FieldProfile('openalex', 'base', ('id', 'doi', 'title', 'authorships', 'referenced_works'))
+OPENALEX_EXTENDED = FieldProfile('openalex', 'extended', ('id', 'doi', 'authorships', 'referenced_works'))
+OPENALEX_CITATIONS = FieldProfile('openalex', 'citations', ('id', 'doi', 'authorships'))
+OPENALEX_AUTHORS = FieldProfile('openalex', 'authors', ('id', 'last_known_institutions'))
+
+S2_EXTENDED = FieldProfile('semantic_scholar', 'extended',
+                           ('title', 'authors.name', 'abstract', 'tldr', 'citations', 'citationCount', 'externalIds'))
+S2_CITATIONS = FieldProfile('semantic_scholar', 'citations',
+                            ('title', 'year', 'venue', 'externalIds', 'authors.name'))
+
+# Fields of each citing paper on /paper/{id}/citations pages, matching the inline ``citations`` entries
+S2_CITING_PAPERS = FieldProfile('semantic_scholar', 'citing_papers', ('title',))
+
+PROFILES = [OPENALEX_FULL, OPENALEX_BASE, OPENALEX_EXTENDED, OPENALEX_CITATIONS, S2_EXTENDED, S2_CITATIONS]
+
+# Profile used by each crawler stage, per API
+STAGE_PROFILES = {
+    'base': {'openalex': OPENALEX_BASE},
+    'extended': {'openalex': OPENALEX_EXTENDED, 'semantic_scholar': S2_EXTENDED},
+    'citations': {'openalex': OPENALEX_CITATIONS, 'semantic_scholar': S2_CITATIONS},
+}
+
+
+def get_profile(api_name, stage=None):
+    """Return the field profile ``stage`` declares for ``api_name``, or None.
+
+    Clients created outside of a stage fall back to per-method defaults.
+    """
+    return STAGE_PROFILES.get(stage, {}).get(api_name)
+
+
+def wider_profiles(profile):
+    """Other known profiles of the same API whose responses cover ``profile``.
+
+    Ordered from the narrowest to the full object, so the cheapest cached
+    response is tried first.
+    """
+    candidates = [p for p in PROFILES
+                  if p.api_name == profile.api_name and p != profile and p.covers(profile)]
+    return sorted(candidates, key=lambda p: len(p.fields) if p.fields else float('inf'))
@@ -1,21 +1,226 @@
 from api_clients.base_api_client import BaseApiClient
+from api_clients.field_profiles import OPENALEX_FULL, OPENALEX_AUTHORS, get_profile
 from config import OPENALEX_API_URL, OPENALEX_RATE_LIMIT
+from utils.author_institution_store import get_author_institution_store
+from utils.openalex_snapshot import SNAPSHOT_PROFILE, get_openalex_snapshot_index, normalize_doi
 import logging
 
 class OpenAlexClient(BaseApiClient):
 
-    def __init__(self):
+    # OpenAlex accepts up to 50 values in one OR-filter
+    DOI_BATCH_SIZE = 50
+    # Largest page OpenAlex serves
+    HARVEST_PAGE_SIZE = 200
+    OPENALEX_AUTHORS_URL = "https://api.openalex.org/authors"
+
+    def __init__(self, stage=None):
         super().__init__()
+        # Fields requested with select=, narrowed to what the crawler stage uses
+        self.profile = get_profile('openalex', stage) or OPENALEX_FULL
+        self.author_store = get_author_institution_store()
+        self.snapshot = get_openalex_snapshot_index()
 
     def request_by_work_id(self, work_id):
         url = f"{OPENALEX_API_URL}/{work_id}"
-        return self.make_request(url, api_name='openalex', rate_limit=OPENALEX_RATE_LIMIT)
+        return self.make_request(url, api_name='openalex', rate_limit=OPENALEX_RATE_LIMIT, profile=self.profile)
     
     def request_by_doi(self, doi):
         if not doi:
             return None
-        url = f"{OPENALEX_API_URL}/doi:{doi}"
-        return self.make_request(url, api_name='openalex', rate_limit=OPENALEX_RATE_LIMIT)
+        work = self._snapshot_works([doi]).get(doi)
+        if work is not None:
+            return work
+        return self.make_request(self._doi_url(doi), api_name='openalex', rate_limit=OPENALEX_RATE_LIMIT,
+                                 profile=self.profile)
+    
+    def request_by_dois(self, dois):
+        """Resolve many DOIs with ``filter=doi:a|b|c`` requests of up to 50 DOIs.
+        
+        DOIs in the local snapshot index are answered from it. Every work
+        fetched is cached under the same key ``request_by_doi`` uses, and DOIs
+        OpenAlex does not know are cached as not found.
+        
+        Args:
+            dois: Iterable of DOIs
+            
+        Returns:
+            Dict mapping each requested DOI to its work, or None if not found
+        """
+        results, unbatchable, batches = self._plan_doi_batches(dois)
+        for doi in unbatchable:
+            results[doi] = self.request_by_doi(doi)
+        
+        for chunk in batches:
+            response = self.make_request(OPENALEX_API_URL, params=self._doi_batch_params(chunk), api_name='openalex',
+                                         rate_limit=OPENALEX_RATE_LIMIT, use_cache=False, profile=self.profile)
+            self._store_doi_batch(chunk, response, results)
+        return self._share_doi_variants(results)
+    
+    def _plan_doi_batches(self, dois):
+        """Answer what the snapshot index and the cache can and split the remaining DOIs into batches.
+        
+        Returns:
+            Tuple of (results dict with every DOI, DOIs to look up one by one,
+            list of DOI chunks to request with an OR-filter)
+        """
+        dois = list(dict.fromkeys(doi for doi in dois if doi))
+        results = {doi: None for doi in dois}
+        snapshot_works = self._snapshot_works(dois)
+        results.update(snapshot_works)
+        # Spellings of one DOI share a cache key, so only the first of them is looked up
+        url_to_doi = {}
+        for doi in dois:
+            if doi not in snapshot_works:
+                url_to_doi.setdefault(self._doi_url(doi), doi)
+        
+        params = self.profile.to_params()
+        cached = self.cache.lookup_many(url_to_doi, params) if self.cache else {}
+        # Fresh entries answer directly, including DOIs already known to be missing
+        cached = {url: entry for url, entry in cached.items() if self.cache.is_fresh(entry, 'openalex')}
+        for url, entry in cached.items():
+            results[url_to_doi[url]] = entry.data
+        
+        missing = []
+        for url, doi in url_to_doi.items():
+            if url in cached:
+                continue
+            # A response cached for a wider profile (e.g. a full work) also answers this one
+            work = self._lookup_wider(url, params, self.profile, 'openalex')
+            if work is not None:
+                results[doi] = work
+            else:
+                missing.append(doi)
+        # '|' and ',' are filter separators, so such DOIs are looked up one by one
+        unbatchable = [doi for doi in missing if '|' in doi or ',' in doi]
+        batchable = [doi for doi in missing if doi not in unbatchable]
+        batches = [batchable[i:i + self.DOI_BATCH_SIZE] for i in range(0, len(batchable), self.DOI_BATCH_SIZE)]
+        return results, unbatchable, batches
+    
+    def _snapshot_works(self, dois):
+        """Works of the local snapshot index for ``dois``, trimmed to this client's profile."""
+        if self.snapshot is None or not dois or not SNAPSHOT_PROFILE.covers(self.profile):
+            return {}
+        try:
+            works = self.snapshot.get_many(dois)
+        except Exception as e:
+            logging.debug(f"OpenAlex snapshot lookup failed: {e}")
+            return {}
+        return {doi: self.profile.project(work) for doi, work in works.items()}
+    
+    def _doi_url(self, doi):
+        """Cache key URL of a DOI lookup; spellings of the same DOI map to the same URL."""
+        return f"{OPENALEX_API_URL}/doi:{self._normalize_doi(doi)}"
+    
+    def _share_doi_variants(self, results):
+        """Give DOIs requested in another spelling (case, resolver prefix) the work found for their twin."""
+        by_normalized_doi = {self._normalize_doi(doi): work for doi, work in results.items() if work is not None}
+        for doi, work in results.items():
+            if work is None:
+                results[doi] = by_normalized_doi.get(self._normalize_doi(doi))
+        return results
+    
+    def _doi_batch_params(self, chunk):
+        # Duplicate works can share a DOI, so a batch may match more works than it has DOIs
+        return {'filter': 'doi:' + '|'.join(chunk), 'per_page': self.HARVEST_PAGE_SIZE}
+    
+    def _store_doi_batch(self, chunk, response, results):
+        """Match a batch response to its DOIs, caching hits and misses per DOI.
+        
+        DOIs are cached as not found only if the response holds every matching
+        work; if duplicates overflowed the page, they are left uncached.
+        """
+        if response is None or 'results' not in response:
+            return
+        
+        by_normalized_doi = {self._normalize_doi(doi): doi for doi in chunk}
+        found = {}
+        for work in response['results']:
+            doi = by_normalized_doi.get(self._normalize_doi(work.get('doi')))
+            if doi:
+                found[doi] = work
+        
+        results.update(found)
+        if self.cache:
+            params = self.profile.to_params()
+            self.cache.set_many({self._doi_url(doi): work for doi, work in found.items()}, params)
+            count = (response.get('meta') or {}).get('count')
+            if count is not None and count > len(response['results']):
+                logging.warning(f"OpenAlex matched {count} works for a batch of {len(chunk)} DOIs; "
+                                "DOIs not on the page are not cached as missing")
+                return
+            for doi in chunk:
+                if doi not in found:
+                    self.cache.set_negative(self._doi_url(doi), params)
+    
+    def _normalize_doi(self, doi):
+        """Lowercase DOI without resolver prefix, as OpenAlex compares them."""
+        return normalize_doi(doi)
+    
+    def harvest_venue(self, source_ids, first_year, last_year):
+        """Fetch every work a venue published in a range of years, 200 per request.
+        
+        Pages are walked with OpenAlex cursor pagination. Each work with a DOI
+        is also cached under the key ``request_by_doi`` uses, so later lookups
+        of these papers, in this crawl or a later stage, need no request. A
+        harvest whose pages were all fetched is cached as a whole, so the next
+        run over the same venue and years is answered from the cache.
+        
+        Args:
+            source_ids: OpenAlex source IDs of the venue (e.g. "S4363608652")
+            first_year: First publication year
+            last_year: Last publication year
+            
+        Returns:
+            List of works, with the fields of this client's profile
+        """
+        params = self._harvest_params(source_ids, first_year, last_year)
+        works = self._cached_harvest(params)
+        if works is not None:
+            return works
+        
+        works = []
+        cursor = '*'
+        while cursor:
+            response = self.make_request(OPENALEX_API_URL, params={**params, 'cursor': cursor},
+                                         api_name='openalex', rate_limit=OPENALEX_RATE_LIMIT, use_cache=False,
+                                         profile=self.profile)
+            if response is None:
+                # Partial harvests are not cached; the caller falls back to DOI lookups
+                return works
+            cursor = self._store_harvest_page(response, works)
+        self._cache_harvest(params, works)
+        return works
+    
+    def _harvest_params(self, source_ids, first_year, last_year):
+        sources = '|'.join(source_id.rstrip('/').split('/')[-1] for source_id in source_ids)
+        return {'filter': f'primary_location.source.id:{sources},publication_year:{first_year}-{last_year}',
+                'per_page': self.HARVEST_PAGE_SIZE}
+    
+    def _cached_harvest(self, params):
+        """Works of a complete earlier harvest with these params, or None."""
+        if self.cache is None:
+            return None
+        profiled = self.profile.to_params(params)
+        harvest = self.cache.get(OPENALEX_API_URL, profiled, 'openalex')
+        if harvest is None:
+            harvest = self._lookup_wider(OPENALEX_API_URL, profiled, self.profile, 'openalex')
+        return harvest['results'] if harvest else None
+    
+    def _cache_harvest(self, params, works):
+        """Cache a complete harvest under its params without a cursor."""
+        if self.cache:
+            self.cache.set(OPENALEX_API_URL, self.profile.to_params(params), {'results': works})
+    
+    def _store_harvest_page(self, response, works):
+        """Add a harvest page to ``works`` and the cache; return the next cursor, or None after the last page."""
+        if not response or not response.get('results'):
+            return None
+        page = response['results']
+        works.extend(page)
+        if self.cache:
+            self.cache.set_many({self._doi_url(work['doi']): work for work in page if work.get('doi')},
+                                self.profile.to_params())
+        return (response.get('meta') or {}).get('next_cursor')
     
     def get_referenced_works(self, doi=None, work_id=None):
         """Get the list of works referenced by this paper.
@@ -48,19 +253,39 @@ class OpenAlexClient(BaseApiClient):
         Returns:
             List of authors with institutions, or None if not found
         """
-        response = self.request_by_doi(doi)
+        return self.get_authors_and_affiliations_from_work(self.request_by_doi(doi), use_author_fallback)
+    
+    def get_authors_and_affiliations_from_work(self, work, use_author_fallback=True, author_institutions=None):
+        """Extract authors and affiliations from an already fetched OpenAlex work.
+        
+        Args:
+            work: OpenAlex work object (e.g. from ``request_by_dois``) or None
+            use_author_fallback: If True, use author's last_known_institution as fallback
+                                when paper has no institutions
+            author_institutions: Fallback institutions resolved beforehand with
+                                 ``prefetch_author_institutions``
+        
+        Returns:
+            List of authors with institutions, or None if work is None
+        """
         authors_data = []
-        if response is not None:
-            authors = response["authorships"]
+        if work is not None:
+            authors = work["authorships"]
+            if use_author_fallback and author_institutions is None:
+                author_institutions = self.prefetch_author_institutions([work])
             for author in authors:
                 author_name = author["author"]["display_name"]
                 author_instituitons = author["institutions"]
                 
-                # If no institutions in paper and fallback enabled, try author profile
+                # If no institutions in paper and fallback enabled, use author profile
                 if not author_instituitons and use_author_fallback:
                     author_id = author["author"].get("id")
                     if author_id:
-                        author_profile = self._get_author_last_institution(author_id)
+                        author_code = self._author_code(author_id)
+                        if author_code in author_institutions:
+                            author_profile = author_institutions[author_code]
+                        else:
+                            author_profile = self._get_author_last_institution(author_id)
                         if author_profile:
                             author_instituitons = [author_profile]
                 
@@ -79,39 +304,121 @@ class OpenAlexClient(BaseApiClient):
         Returns:
             Institution dict or None (returns first from last_known_institutions)
         """
-        try:
-            # Convert web URL to API URL if needed
-            # From: https://openalex.org/A5101567478
-            # To:   https://api.openalex.org/authors/A5101567478
-            if author_id.startswith("https://openalex.org/"):
-                author_code = author_id.split("/")[-1]  # Extract "A5101567478"
-                api_url = f"https://api.openalex.org/authors/{author_code}"
-            else:
-                api_url = author_id
-            
-            response = self.make_request(api_url, api_name='openalex', rate_limit=OPENALEX_RATE_LIMIT)
+        return self.get_authors_last_institutions([author_id]).get(self._author_code(author_id))
+    
+    def get_authors_last_institutions(self, author_ids):
+        """Resolve the last known institution of many authors at once.
+        
+        Authors already in the persistent author map are answered from it; the
+        rest are fetched with ``filter=openalex:A1|A2|...`` requests of up to
+        50 authors and added to the map.
+        
+        Args:
+            author_ids: OpenAlex author IDs (URLs or bare IDs like "A5101567478")
             
-            # Try last_known_institutions (plural) first
-            if response and "last_known_institutions" in response:
-                insts = response["last_known_institutions"]
-                if insts and len(insts) > 0:
-                    # Return the first institution
-                    inst = insts[0]
-                    return {
-                        "display_name": inst.get("display_name", ""),
-                        "country_code": inst.get("country_code", "")
-                    }
+        Returns:
+            Dict mapping bare author ID to an institution dict or None
+        """
+        codes, institutions, batches = self._plan_author_batches(author_ids)
+        for chunk in batches:
+            try:
+                response = self.make_request(self.OPENALEX_AUTHORS_URL, params=self._author_batch_params(chunk),
+                                             api_name='openalex', rate_limit=OPENALEX_RATE_LIMIT, use_cache=False,
+                                             profile=OPENALEX_AUTHORS)
+            except Exception as e:
+                logging.debug(f"Could not get author institutions for {chunk}: {e}")
+                continue
+            self._store_author_batch(chunk, response, institutions)
+        
+        return {code: institutions.get(code) for code in codes}
+    
+    def _plan_author_batches(self, author_ids):
+        """Answer what the author map can and split the other authors into batches.
+        
+        Returns:
+            Tuple of (bare author IDs, institutions known so far, list of
+            author ID chunks to request)
+        """
+        codes = list(dict.fromkeys(self._author_code(a) for a in author_ids if a))
+        institutions = self.author_store.get_many(codes)
+        missing = [code for code in codes if code not in institutions]
+        # Authors a recent batch did not return are not asked for again until the negative TTL ends
+        if self.cache and missing:
+            url_to_code = {self._author_url(code): code for code in missing}
+            absent = {url_to_code[url] for url, entry in
+                      self.cache.lookup_many(url_to_code, OPENALEX_AUTHORS.to_params()).items()
+                      if entry.is_negative and self.cache.is_fresh(entry, 'openalex')}
+            institutions.update(dict.fromkeys(absent))
+            missing = [code for code in missing if code not in absent]
+        batches = [missing[i:i + self.DOI_BATCH_SIZE] for i in range(0, len(missing), self.DOI_BATCH_SIZE)]
+        return codes, institutions, batches
+    
+    def _author_batch_params(self, chunk):
+        return {'filter': 'openalex:' + '|'.join(chunk), 'per_page': self.DOI_BATCH_SIZE}
+    
+    def _store_author_batch(self, chunk, response, institutions):
+        """Add the authors of a batch response to ``institutions`` and the author map.
+        
+        Authors of the chunk missing from the response (merged or deleted IDs,
+        or a gap in the response) are cached as not found, so they are not
+        requested again one by one but are retried once the negative TTL ends.
+        """
+        if not response or 'results' not in response:
+            return
+        resolved = {}
+        for author in response['results']:
+            code = self._author_code(author.get('id'))
+            if code in chunk:
+                resolved[code] = self._last_institution_from_author(author)
+        self.author_store.set_many(resolved)
+        institutions.update(resolved)
+        absent = [code for code in chunk if code not in resolved]
+        institutions.update(dict.fromkeys(absent))
+        if self.cache:
+            for code in absent:
+                self.cache.set_negative(self._author_url(code), OPENALEX_AUTHORS.to_params())
+    
+    def _author_url(self, code):
+        return f"{self.OPENALEX_AUTHORS_URL}/{code}"
+    
+    def prefetch_author_institutions(self, works):
+        """Resolve, in one batch, the fallback institutions a set of works will need.
+        
+        Args:
+            works: Iterable of OpenAlex works (None entries are ignored)
             
-            # Fallback to last_known_institution (singular) if available
-            if response and "last_known_institution" in response:
-                inst = response["last_known_institution"]
-                if inst:
-                    return {
-                        "display_name": inst.get("display_name", ""),
-                        "country_code": inst.get("country_code", "")
-                    }
-        except Exception as e:
-            logging.debug(f"Could not get author institution for {author_id}: {e}")
+        Returns:
+            Dict mapping bare author ID to an institution dict or None, for every
+            author that has no institution on its paper
+        """
+        return self.get_authors_last_institutions(self._fallback_author_ids(works))
+    
+    def _fallback_author_ids(self, works):
+        """IDs of the authors that have no institution on their paper."""
+        author_ids = []
+        for work in works:
+            if not work:
+                continue
+            for authorship in work.get("authorships", []):
+                author_id = authorship.get("author", {}).get("id")
+                if author_id and not authorship.get("institutions"):
+                    author_ids.append(author_id)
+        return author_ids
+    
+    def _author_code(self, author_id):
+        """Bare author ID, e.g. "A5101567478" from "https://openalex.org/A5101567478"."""
+        return author_id.rstrip("/").split("/")[-1] if author_id else None
+    
+    def _last_institution_from_author(self, author):
+        # OPENALEX_AUTHORS selects last_known_institutions, the list that replaced the singular field
+        insts = author.get("last_known_institutions")
+        if insts:
+            # Use the first institution
+            inst = insts[0]
+            return {
+                "display_name": inst.get("display_name", ""),
+                "country_code": inst.get("country_code", "")
+            }
         return None
     
     def search_by_title(self, title, author_names=None):
@@ -127,6 +434,12 @@ class OpenAlexClient(BaseApiClient):
         if not title:
             return None
         
+        url = OPENALEX_API_URL
+        response = self.make_request(url, params=self._title_search_params(title), api_name='openalex',
+                                     rate_limit=OPENALEX_RATE_LIMIT, profile=self.profile)
+        return self._first_result(response)
+    
+    def _title_search_params(self, title):
         # Clean and prepare title for search
         # Remove special characters that might cause issues
         clean_title = title.strip()
@@ -134,14 +447,12 @@ class OpenAlexClient(BaseApiClient):
             clean_title = clean_title[:-1]
         
         # Use search parameter (not filter) for title matching
-        params = {
+        return {
             'search': clean_title,
             'per_page': 3  # Get top 3 results for better matching
         }
-        
-        url = OPENALEX_API_URL
-        response = self.make_request(url, params=params, api_name='openalex', rate_limit=OPENALEX_RATE_LIMIT)
-        
+    
+    def _first_result(self, response):
         if response and 'results' in response and len(response['results']) > 0:
             return response['results'][0]
         return None
@@ -161,8 +472,10 @@ class OpenAlexClient(BaseApiClient):
         if not dblp_author_names:
             return None
         
-        response = self.search_by_title(title, dblp_author_names)
-        
+        return self._institutions_from_match(self.search_by_title(title, dblp_author_names), dblp_author_names)
+    
+    def _institutions_from_match(self, response, dblp_author_names):
+        """Institutions of a title-search match, aligned with the DBLP authors."""
         if response is None:
             return None
         
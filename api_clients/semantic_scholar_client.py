@@ -1,32 +1,193 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from api_clients.base_api_client import BaseApiClient
+from api_clients.field_profiles import get_profile, S2_EXTENDED, S2_CITATIONS, S2_CITING_PAPERS
 from config import (SEMANTIC_SCHOLAR_API_KEY, SEMANTIC_SCHOLAR_API_URL, 
-                    USE_SEMANTIC_SCHOLAR_API_KEYS, SEMANTIC_SCHOLAR_RATE_LIMIT)
+                    USE_SEMANTIC_SCHOLAR_API_KEYS, SEMANTIC_SCHOLAR_RATE_LIMIT,
+                    MAX_CITATIONS_PER_PAPER, CITATION_PAGE_WORKERS)
 
 class SemanticScholarClient(BaseApiClient):
 
-    def __init__(self):
+    # /paper/batch accepts at most 500 IDs per request
+    BATCH_SIZE = 500
+    # /paper/{id}/citations serves at most 1000 citations per page
+    CITATIONS_PAGE_SIZE = 1000
+    # Paper records list at most 1000 citations inline; longer lists are cut off
+    INLINE_CITATIONS_LIMIT = 1000
+
+    def __init__(self, stage=None):
         super().__init__()
+        self.profile = get_profile('semantic_scholar', stage)
 
     def request_by_doi(self, doi):
         if not doi:
             return None
         url = f"{SEMANTIC_SCHOLAR_API_URL}/{doi}"
         headers = {"x-api-key": SEMANTIC_SCHOLAR_API_KEY} if USE_SEMANTIC_SCHOLAR_API_KEYS else None
-        params = {'fields': 'title,authors.name,abstract,tldr,embedding,citations,externalIds'}
-        return self.make_request(url, params=params, headers=headers, 
+        return self.make_request(url, headers=headers, profile=self.profile or S2_EXTENDED,
                                api_name='semantic_scholar', rate_limit=SEMANTIC_SCHOLAR_RATE_LIMIT)
     
     def batch_request(self, citations):
+        """Fetch the records of a list of paperIds, in order.
+        
+        IDs unknown to Semantic Scholar come back as None; IDs of failed
+        batches are left out.
+        """
+        records = self.batch_by_ids(citations)
+        return [records[paper_id] for paper_id in citations if paper_id in records]
+    
+    def batch_by_dois(self, dois):
+        """Resolve many DOIs with ``/paper/batch`` requests of up to 500 ``DOI:`` IDs.
+        
+        Papers are cached under the same key ``request_by_doi`` uses, so a DOI
+        fetched either way is not requested again.
+        
+        Args:
+            dois: Iterable of DOIs
+            
+        Returns:
+            Dict mapping each requested DOI to its paper, or None if not found.
+            DOIs of batches that failed are left out so callers can retry them.
+        """
+        return self._cached_batch(dois, self.profile or S2_EXTENDED, id_prefix="DOI:")
+    
+    def batch_by_ids(self, paper_ids):
+        """Fetch many papers by Semantic Scholar paperId, 500 unique IDs per request.
+        
+        Args:
+            paper_ids: Iterable of paperIds, duplicates are requested once
+            
+        Returns:
+            Dict mapping each paperId to its record, or None if not found.
+            IDs of batches that failed are left out.
+        """
+        return self._cached_batch(paper_ids, self.profile or S2_CITATIONS)
+    
+    def _cached_batch(self, ids, profile, id_prefix=""):
+        """Resolve IDs through ``/paper/batch``, caching each record on its own.
+        
+        Every record is cached as if it had been fetched with
+        ``GET /paper/<id>`` and the same fields, so only IDs missing from the
+        cache go over the wire and reruns reuse earlier batches whatever IDs
+        they were grouped with. IDs the API does not know are cached as not
+        found.
+        """
+        results, batches = self._plan_batches(ids, profile)
+        for chunk in batches:
+            response = self._post_batch([id_prefix + i for i in chunk], profile)
+            self._store_batch(chunk, response, profile, results)
+        return results
+    
+    def _plan_batches(self, ids, profile):
+        """Answer what the cache can and split the remaining IDs into batches.
+        
+        Returns:
+            Tuple of (results dict for cached IDs, list of ID chunks to request)
+        """
+        params = profile.to_params()
+        ids = list(dict.fromkeys(i for i in ids if i))
+        url_to_id = {f"{SEMANTIC_SCHOLAR_API_URL}/{i}": i for i in ids}
+        results = {}
+        
+        cached = self.cache.lookup_many(url_to_id, params) if self.cache else {}
+        for url, entry in cached.items():
+            if self.cache.is_fresh(entry, 'semantic_scholar'):
+                results[url_to_id[url]] = entry.data
+        missing = [i for i in ids if i not in results]
+        return results, [missing[i:i + self.BATCH_SIZE] for i in range(0, len(missing), self.BATCH_SIZE)]
+    
+    def _store_batch(self, chunk, response, profile, results):
+        """Add a batch response to ``results`` and cache each record on its own."""
+        # The batch endpoint answers with one entry per ID, in order, null when unknown
+        if not isinstance(response, list) or len(response) != len(chunk):
+            return
+        results.update(zip(chunk, response))
+        if self.cache:
+            params = profile.to_params()
+            self.cache.set_many({f"{SEMANTIC_SCHOLAR_API_URL}/{i}": record
+                                 for i, record in zip(chunk, response) if record}, params)
+            for i, record in zip(chunk, response):
+                if not record:
+                    self.cache.set_negative(f"{SEMANTIC_SCHOLAR_API_URL}/{i}", params)
+    
+    def _post_batch(self, ids, profile):
+        """POST one chunk of IDs to /paper/batch and return the raw response."""
         url = f"{SEMANTIC_SCHOLAR_API_URL}/batch"
         headers = {"x-api-key": SEMANTIC_SCHOLAR_API_KEY} if USE_SEMANTIC_SCHOLAR_API_KEYS else None
-        params = {'fields': 'title,year,venue,externalIds,authors.name'}
-        responses = []
-        
-        for i in range(0, len(citations), 500):
-            batch_citations = citations[i:i+500]
-            response = self.make_request(url, method='POST', params=params, 
-                                        citations=batch_citations, headers=headers,
-                                        api_name='semantic_scholar', rate_limit=SEMANTIC_SCHOLAR_RATE_LIMIT)
-            if response:
-                responses.extend(response)
-        return responses
\ No newline at end of file
+        # Records are cached one by one by the caller, not as a whole batch
+        return self.make_request(url, method='POST', profile=profile, citations=ids, headers=headers,
+                                 api_name='semantic_scholar', rate_limit=SEMANTIC_SCHOLAR_RATE_LIMIT,
+                                 use_cache=False)
+
+    def get_all_citations(self, paper_id, citation_count, on_page, max_citations=MAX_CITATIONS_PER_PAPER,
+                          checkpoints=None):
+        """Page through ``/paper/{id}/citations`` for papers whose inline list is truncated.
+        
+        Pages are requested concurrently; the token bucket keeps them within
+        the Semantic Scholar rate budget. Each page is handed to ``on_page``
+        and written to ``checkpoints`` as it arrives and is not kept, so a
+        paper with tens of thousands of citations never sits in memory. Pages
+        already in ``checkpoints`` are not requested again, only handed on.
+        
+        Args:
+            paper_id: Semantic Scholar paperId
+            citation_count: The paper's ``citationCount``, used to plan the pages
+            on_page: Called with (offset, citing papers) for every page, in
+                     arrival order; citing papers are {"paperId", "title"} dicts
+            max_citations: Citations fetched at most for one paper
+            checkpoints: Optional CitationCheckpoints
+            
+        Returns:
+            True if every planned page was fetched. Pages that failed are
+            left out, to be fetched by a later run.
+        """
+        fetched, offsets = self._plan_citation_pages(paper_id, citation_count, max_citations, checkpoints, on_page)
+        if offsets:
+            with ThreadPoolExecutor(max_workers=min(CITATION_PAGE_WORKERS, len(offsets))) as pool:
+                futures = {pool.submit(self._get_citations_page, paper_id, offset, limit): offset
+                           for offset, limit in offsets}
+                for future in as_completed(futures):
+                    # Dropping the future frees its page once it has been handed on
+                    offset = futures.pop(future)
+                    self._store_citations_page(paper_id, offset, future.result(), fetched, checkpoints, on_page)
+        return self._all_pages_fetched(paper_id, fetched, offsets)
+    
+    def _plan_citation_pages(self, paper_id, citation_count, max_citations, checkpoints, on_page):
+        """Hand on the checkpointed pages and list the ones still to fetch.
+        
+        Returns:
+            Tuple of (set of offsets already fetched, list of (offset, limit)
+            pages to request)
+        """
+        fetched = set()
+        if checkpoints:
+            for offset, citing_papers in checkpoints.iter_pages(paper_id):
+                on_page(offset, citing_papers)
+                fetched.add(offset)
+        total = min(citation_count or 0, max_citations)
+        offsets = [(offset, min(self.CITATIONS_PAGE_SIZE, total - offset))
+                   for offset in range(0, total, self.CITATIONS_PAGE_SIZE) if offset not in fetched]
+        return fetched, offsets
+    
+    def _get_citations_page(self, paper_id, offset, limit):
+        url = f"{SEMANTIC_SCHOLAR_API_URL}/{paper_id}/citations"
+        headers = {"x-api-key": SEMANTIC_SCHOLAR_API_KEY} if USE_SEMANTIC_SCHOLAR_API_KEYS else None
+        # Pages are kept by the checkpoints, not by the response cache
+        return self.make_request(url, params={'offset': offset, 'limit': limit}, headers=headers,
+                                 profile=S2_CITING_PAPERS, api_name='semantic_scholar',
+                                 rate_limit=SEMANTIC_SCHOLAR_RATE_LIMIT, use_cache=False)
+    
+    def _store_citations_page(self, paper_id, offset, response, fetched, checkpoints, on_page):
+        if not response or 'data' not in response:
+            return
+        citing_papers = [item["citingPaper"] for item in response['data'] if item.get("citingPaper")]
+        if checkpoints:
+            checkpoints.append(paper_id, offset, citing_papers)
+        on_page(offset, citing_papers)
+        fetched.add(offset)
+    
+    def _all_pages_fetched(self, paper_id, fetched, offsets):
+        failed = [offset for offset, _ in offsets if offset not in fetched]
+        if failed:
+            logging.warning(f"Could not get {len(failed)} citation pages of {paper_id}; they are retried on the next run")
+        return not failed
@@ -0,0 +1,80 @@
+"""Time DBLP year-page parsing on recorded pages.
+
+Compares the single-pass section walker in ``crawler.dblp_parser`` with the
+previous ``find_previous`` lookups, and checks both keep the same papers.
+
+Usage (from the repository root):
+    python -m benchmarks.dblp_parse_benchmark page1.html page2.html --repeat 5
+    python -m benchmarks.dblp_parse_benchmark --url https://dblp.org/db/conf/eurosys/eurosys2023.html
+"""
+import argparse
+import time
+from bs4 import BeautifulSoup
+from config import SKIP_SECTIONS
+from crawler.dblp_parser import parse_year_page, parse_article
+
+
+def parse_year_page_find_previous(page, skip_sections=SKIP_SECTIONS):
+    """Reference implementation: three ``find_previous`` walks per publ-list."""
+    records = []
+    soup = BeautifulSoup(page, features="lxml")
+    for publ_list in soup.findAll("ul", attrs={"class": "publ-list"}):
+        headers = [publ_list.find_previous(level) for level in ("h2", "h3", "h4")]
+        texts = [header.text.lower().replace('\n', '') for header in headers if header is not None]
+        if any(section in text for section in skip_sections for text in texts):
+            continue
+        for article in publ_list.findAll('li', {'itemtype': 'http://schema.org/ScholarlyArticle'}):
+            records.append(parse_article(article))
+    soup.decompose()
+    return records
+
+
+def load_pages(paths, urls):
+    pages = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            pages[path] = f.read()
+    if urls:
+        from api_clients.dblp_client import DblpClient
+        client = DblpClient()
+        for url in urls:
+            page = client.get_page(url)
+            if page is not None:
+                pages[url] = page
+    return pages
+
+
+def time_parser(parser, pages, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages.values():
+            parser(page, SKIP_SECTIONS)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DBLP year-page parsing")
+    parser.add_argument("pages", nargs="*", help="Saved DBLP proceedings pages (HTML)")
+    parser.add_argument("--url", action="append", default=[], help="DBLP page to fetch (cached by DblpClient)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per parser; the best is reported")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages, args.url)
+    if not pages:
+        parser.error("give at least one page file or --url")
+
+    for name, page in pages.items():
+        kept = [r.title for r in parse_year_page(page, SKIP_SECTIONS)]
+        reference = [r.title for r in parse_year_page_find_previous(page, SKIP_SECTIONS)]
+        if kept != reference:
+            print(f"\t> {name}: {len(kept)} papers kept vs {len(reference)} with find_previous <")
+
+    for label, fn in (("find_previous", parse_year_page_find_previous), ("single pass", parse_year_page)):
+        elapsed = time_parser(fn, pages, args.repeat)
+        print(f"{label:>14}: {elapsed:.3f}s for {len(pages)} pages")
+
+
+if __name__ == "__main__":
+    main()
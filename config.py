@@ -3,6 +3,7 @@ from src.config.settings import (
     api_config,
     request_config,
     crawler_config,
+    concurrency_config,
     path_config,
     logging_config,
     # Legacy-compatible constants
@@ -11,18 +12,43 @@ from src.config.settings import (
     SEMANTIC_SCHOLAR_API_URL,
     OPENALEX_API_URL,
     REQUEST_TIMEOUT,
+    REQUEST_TIMEOUTS,
     MAX_RETRIES,
     RETRY_BACKOFF_FACTOR,
     SEMANTIC_SCHOLAR_RATE_LIMIT,
     OPENALEX_RATE_LIMIT,
+    CROSSREF_RATE_LIMIT,
+    API_RATE_LIMITS,
+    DBLP_MAX_CONNECTIONS,
     MAX_WORKERS,
+    PIPELINE_QUEUE_SIZE,
+    MAX_CITATIONS_PER_PAPER,
+    CITATION_PAGE_WORKERS,
     USE_CACHING,
+    OUTPUT_FORMAT,
+    CACHE_BACKEND,
+    MEMORY_CACHE_MAX_ENTRIES,
+    MEMORY_CACHE_MAX_BYTES,
+    CACHE_TTL,
+    NEGATIVE_CACHE_TTL,
     ENABLE_PROGRESS_BAR,
     SKIP_SECTIONS,
+    DBLP_SOURCE,
+    OPENALEX_VENUE_SOURCES,
+    ADAPTIVE_CONCURRENCY,
+    WORKER_POOL_SIZE,
+    HTTP_POOL_SIZE,
+    ASYNC_TASKS,
     DEFAULT_OUTPUT_DIR,
     BASE_CRAWLER_OUTPUT_DIR,
     EXTENDED_CRAWLER_OUTPUT_DIR,
     CITATIONS_CRAWLER_OUTPUT_DIR,
+    CACHE_DIR,
+    CACHE_DB_PATH,
+    AUTHOR_INSTITUTIONS_DB_PATH,
+    DBLP_DUMP_PATH,
+    OPENALEX_SNAPSHOT_DB_PATH,
+    CITATION_CHECKPOINT_DIR,
     LOG_FILE,
     LOG_LEVEL,
     LOG_FORMAT,
@@ -2,11 +2,14 @@ from crawler.abstract_crawler import AbstractCrawler
 from utils.file_utils import FileUtils
 from api_clients.factory import APIFactory
 from utils.paper_data_builder import PaperDataBuilder
-import requests
+from utils.concurrency_controller import get_concurrency_controller
+from utils.single_flight import get_single_flight
+from crawler.dblp_source import get_dblp_source
+from utils.work_matcher import WorkMatcher
+from utils.output_store import get_output_writer
 import re
-from bs4 import BeautifulSoup
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from config import BASE_CRAWLER_OUTPUT_DIR, SKIP_SECTIONS, REQUEST_TIMEOUT, MAX_WORKERS, ENABLE_PROGRESS_BAR
+from config import BASE_CRAWLER_OUTPUT_DIR, ENABLE_PROGRESS_BAR, DBLP_MAX_CONNECTIONS, OPENALEX_VENUE_SOURCES
 import logging
 
 try:
@@ -22,35 +25,70 @@ class BaseCrawler(AbstractCrawler):
         print("----------------- [Base Crawler] -----------------")
         super().__init__(conference, years)
         # internal variables
-        self.data_per_year = {}
+        self.year_links = []
         self.data_to_process = []
+        self.openalex_works = {}
+        self.openalex_works_by_title = {}
+        self.author_institutions = {}
+        self.harvested_works = WorkMatcher()
         # utils and clients
         self.file_utils = FileUtils()
-        self.builder = PaperDataBuilder()
-        self.openalex_client = APIFactory.get_client("openalex")
+        self.output = get_output_writer(conference, "base")
+        self.openalex_client = APIFactory.get_client("openalex", "base")
+        self.dblp_client = APIFactory.get_client("dblp")
+        self.dblp_source = get_dblp_source(self.dblp_client)
+        self.concurrency = get_concurrency_controller()
 
 
     def load_data(self):
         print(f"\t> Loading data for {self.conference} from DBLP <")
-        self.data_to_process = self.__obtain_dblp_data()
-        print(f"\t> Obtained {len(self.data_to_process)} papers from DBLP <")
+        self.year_links = self.dblp_source.get_year_links(self.conference, self.first_year, self.last_year)
+        print(f"\t> Found {len(self.year_links)} DBLP pages for {self.first_year}-{self.last_year} <")
+        self.__harvest_openalex()
+
+
+    def __harvest_openalex(self):
+        """Fetch the venue's OpenAlex works for the crawled years, when its OpenAlex sources are configured."""
+        source_ids = OPENALEX_VENUE_SOURCES.get(self.conference)
+        if not source_ids:
+            return
+        works = self.openalex_client.harvest_venue(source_ids, self.first_year, self.last_year)
+        self.harvested_works = WorkMatcher(works)
+        print(f"\t> Harvested {len(works)} OpenAlex works for {self.conference} <")
 
 
     def process_data(self):
-        print(f"\t> Processing {len(self.data_to_process)} papers with {MAX_WORKERS} workers <")
+        print(f"\t> Processing papers with up to {self.concurrency.max_workers} workers, "
+              f"{DBLP_MAX_CONNECTIONS} DBLP pages at a time <")
         
         # Use progress bar if available and enabled
         use_progress = ENABLE_PROGRESS_BAR and HAS_TQDM
-        iterator = tqdm(self.data_to_process, desc="Processing papers") if use_progress else self.data_to_process
         
-        # Process papers concurrently
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            # Submit all tasks
-            future_to_pub = {executor.submit(self.__get_dblp_paper_data, pub): pub 
-                           for pub in self.data_to_process}
+        # Year pages are downloaded concurrently; each page's papers go to the
+        # enrichment pool as soon as it is parsed, while other pages still load.
+        with ThreadPoolExecutor(max_workers=DBLP_MAX_CONNECTIONS) as page_pool, \
+                ThreadPoolExecutor(max_workers=self.concurrency.max_workers) as paper_pool:
+            page_futures = [page_pool.submit(self.__get_page_records, link) for link in self.year_links]
+            future_to_record = {}
+            for page_future in as_completed(page_futures):
+                try:
+                    records = page_future.result()
+                except Exception as e:
+                    logging.error(f"Error parsing DBLP page: {e}")
+                    continue
+                self.data_to_process.extend(records)
+                self.__prefetch_openalex(records)
+                for record in records:
+                    future_to_record[paper_pool.submit(self.__get_dblp_paper_data, record)] = record
+            
+            print(f"\t> Obtained {len(self.data_to_process)} papers from DBLP, "
+                  f"{sum(1 for w in self.openalex_works.values() if w)} resolved in OpenAlex <")
+            futures = as_completed(future_to_record)
+            if use_progress:
+                futures = tqdm(futures, total=len(future_to_record), desc="Processing papers")
             
             # Collect results as they complete
-            for future in as_completed(future_to_pub):
+            for future in futures:
                 try:
                     paper_data = future.result()
                     if not paper_data:
@@ -68,193 +106,105 @@ class BaseCrawler(AbstractCrawler):
                     if not year:
                         logging.error("Missing year on paper_data; skipping")
                         continue
-                    if year not in self.data_per_year:
-                        self.data_per_year[year] = []
-                    self.data_per_year[year].append(record)
+                    self.output.add_paper(year, record)
                 except Exception as e:
                     logging.error(f"Error processing publication: {e}")
+        logging.info(f"Adaptive concurrency limits: {self.concurrency.limits()}")
+        logging.info(f"Coalesced API requests: {get_single_flight().stats()}")
+
+
+    def __prefetch_openalex(self, records):
+        """Resolve the DOIs of one page's records, and their authors' fallback institutions, in batches.
+        
+        Records found among the harvested venue works, by DOI or else by title,
+        need no DOI lookup.
+        """
+        works = {}
+        matched_by_title = []
+        unmatched = []
+        for record in records:
+            work = self.harvested_works.match(record.doi, record.title)
+            if work is None:
+                unmatched.append(record.doi)
+            elif record.doi:
+                works[record.doi] = work
+            else:
+                self.openalex_works_by_title[record.title] = work
+                matched_by_title.append(work)
+        works.update(self.openalex_client.request_by_dois(unmatched))
+        self.author_institutions.update(
+            self.openalex_client.prefetch_author_institutions(list(works.values()) + matched_by_title))
+        self.openalex_works.update(works)
 
 
     def save_data(self):
         print(f"\t> Saving data for {self.conference} in {BASE_CRAWLER_OUTPUT_DIR} <")
-        filename = f"{self.conference}_base_data"
-        self.file_utils.add_data_to_existing_file(f"{BASE_CRAWLER_OUTPUT_DIR}/{filename}.json", self.data_per_year)
-
+        self.output.commit()
 
-    def __obtain_dblp_data(self):
-        data_to_process = []
-        links = self.__get_links()
-        valid_links = []
-        for link in links:
-            if self.__filter_dblp_links(link) and \
-                any(str(year) in link for year in range(self.first_year, self.last_year + 1)):
-                valid_links.append(link)
 
-        for link in valid_links:
-            resp = requests.get(link, timeout=REQUEST_TIMEOUT)
-            soup = BeautifulSoup(resp.content, features="lxml")
-            pub_list_raw = soup.findAll("ul", attrs={"class": "publ-list"})
-            for pub in pub_list_raw:
-                article_items = pub.find_all('li', {'itemtype': 'http://schema.org/ScholarlyArticle'})
-                header_h2 = pub.find_previous('h2')
-                header_h3 = pub.find_previous('h3')
-                header_h4 = pub.find_previous('h4')
-                if not self.__filter_section(header_h2, header_h3, header_h4):
-                    for article in article_items:
-                        data_to_process.append(article)
-        return data_to_process
+    def __get_page_records(self, link):
+        """Get one DBLP year page's records outside skipped sections."""
+        records = self.dblp_source.get_records(link)
+        if records is None:
+            logging.error(f"Could not download DBLP page {link}")
+            return []
+        return [record for record in records if not self.__filter_paper_title(record.title)]
 
     
-    def __get_links(self):
-        # ATC is under usenix directory in DBLP
-        dblp_directory = "usenix" if self.conference == "atc" else self.conference
-        url = "https://dblp.org/db/conf/" + dblp_directory + "/"
-        html_page = requests.get(url, timeout=REQUEST_TIMEOUT)
-        soup = BeautifulSoup(html_page.text, 'html.parser')
-        link_list = set()
-        for link_elem in soup.findAll('a'):
-            link = link_elem.get('href')
-            if link and url in link:  # to avoid repeated links
-                link_list.add(link)
-        return link_list  # list with all the papers for each year
-    
-
-    def __filter_dblp_links(self, link):
-        # Special cases for conference naming in DBLP
-        if self.conference == "cloud": 
-            conf_pattern = "socc"
-            directory = "cloud"
-        elif self.conference == "atc": 
-            conf_pattern = "usenix"
-            directory = "usenix"
-        else:
-            conf_pattern = self.conference
-            directory = self.conference
+    def __get_dblp_paper_data(self, record):
+        """Enrich a DBLP record with OpenAlex affiliations and referenced works."""
+        # get the openalex data using DOI (resolved in batch by process_data)
+        openalex_work = self.__get_openalex_work(record)
+        openalex_data = self.openalex_client.get_authors_and_affiliations_from_work(
+            openalex_work, author_institutions=self.author_institutions)
         
-        # Pattern accepts both single volume (europar2024.html) and multiple volumes (europar2024-1.html)
-        # but excludes workshops (europar2024w1.html)
-        pattern = rf"https://dblp.org/db/conf/{directory}/{conf_pattern}\d{{4}}(-\d+)?\.html"
+        # get OpenAlex Referenced Works from the same work
+        openalex_referenced_works = None
+        referenced_works = openalex_work.get("referenced_works") if openalex_work else None
+        if referenced_works:
+            # Extract only the ID part from URLs like "https://openalex.org/W1580997674"
+            openalex_referenced_works = []
+            for work in referenced_works:
+                if work and work.startswith("https://openalex.org/"):
+                    work_id = work.split("/")[-1]  # Extract "W1580997674"
+                    openalex_referenced_works.append(work_id)
+                else:
+                    openalex_referenced_works.append(work)
         
-        # Additional check: exclude workshop links (containing 'w' before digit)
-        if re.search(r'\d{{4}}w\d+\.html', link):
-            return False
+        # Fallback: If no DOI/OpenAlex data, try searching by title
+        if openalex_data is None and record.authors:
+            try:
+                institutions_list = self.openalex_client.get_institutions_by_title(record.title, record.authors)
+                if institutions_list:
+                    auth_list = []
+                    for idx, author in enumerate(record.authors):
+                        institutions = institutions_list[idx] if idx < len(institutions_list) else None
+                        auth_list.append({'Author': author, 'Institutions': institutions})
+                    openalex_data = auth_list
+            except Exception as e:
+                logging.debug(f"Could not find institutions by title for {record.title[:50]}...: {e}")
         
-        return bool(re.match(pattern, link))
-    
-
-    def __filter_section(self, header_h2, header_h3, header_h4):
-        header_h2_text = header_h2.text if header_h2 is not None else ""
-        header_h3_text = header_h3.text if header_h3 is not None else ""
-        header_h4_text = header_h4.text if header_h4 is not None else ""
-        lower_header_h2 = header_h2_text.lower().replace('\n', '')
-        lower_header_h3 = header_h3_text.lower().replace('\n', '')
-        lower_header_h4 = header_h4_text.lower().replace('\n', '')
-        if any(section in lower_header_h2 for section in SKIP_SECTIONS):
-            return True
-        if any(section in lower_header_h3 for section in SKIP_SECTIONS):
-            return True
-        if any(section in lower_header_h4 for section in SKIP_SECTIONS):
-            return True
-        return False
-
-
-    def __get_dblp_paper_data(self, publication):
-        publication_year = None
-        paper_title = 'nothing'
-        authors_names =[]
-        openalex_data = None
-        for content_item in publication.contents:
-            class_of_content_item = content_item.attrs.get('class', [0])
-            if 'data' in class_of_content_item:
-                # get the paper title from dblp
-                paper_title = content_item.find('span', attrs={"class": "title", "itemprop": "name"}).text
-                if self.__filter_paper_title(paper_title):
-                    return None
-                # get the publication year from dblp
-                for datePublished in content_item.findAll('span', attrs={"itemprop": "datePublished"}):
-                    publication_year = datePublished.text
-                if publication_year == None:
-                    publication_year = content_item.find('meta', attrs={"itemprop": "datePublished"}).get("content")
-                # get the author's names from dblp paper
-                for author in content_item.findAll('span', attrs={"itemprop": "author"}):
-                    author_name = author.text
-                    if author_name not in authors_names:
-                        authors_names.append(author_name)
-            if 'publ' in class_of_content_item:
-                # Search for links in the entire element, not just contents[0]
-                links = content_item.findAll("a")
-                
-                # Extract OpenAlex link
-                openalex_link = [l.get("href") for l in links if l.get("href") and "openalex" in l.get("href")]
-                openalex_link = openalex_link[0] if openalex_link else None
-                
-                # Extract DOI - Try multiple sources for maximum coverage
-                doi_number = None
-                
-                # Strategy 1: Direct DOI link from DBLP (MOST COMMON)
-                doi_links = [l.get("href") for l in links if l.get("href") and "doi.org" in l.get("href")]
-                if doi_links:
-                    doi_url = doi_links[0]
-                    # Clean DOI from URL
-                    doi_number = doi_url.replace("https://doi.org/", "").replace("http://doi.org/", "")
-                    doi_number = doi_number.replace("https://dx.doi.org/", "").replace("http://dx.doi.org/", "")
-                    # Remove any trailing query parameters
-                    if '?' in doi_number:
-                        doi_number = doi_number.split('?')[0]
-                
-                # Strategy 2: Extract from OpenAlex link (if no direct DOI)
-                elif openalex_link and "doi:" in openalex_link:
-                    doi_number = openalex_link.replace("https://api.openalex.org/works/doi:", "")
-                
-                # get the openalex data using DOI
-                openalex_data = self.openalex_client.get_paper_authors_and_affiliations_doi(doi_number) 
-                
-                # get OpenAlex Referenced Works
-                openalex_referenced_works = None
-                if doi_number:
-                    try:
-                        referenced_works = self.openalex_client.get_referenced_works(doi=doi_number)
-                        if referenced_works:
-                            # Extract only the ID part from URLs like "https://openalex.org/W1580997674"
-                            openalex_referenced_works = []
-                            for work in referenced_works:
-                                if work and work.startswith("https://openalex.org/"):
-                                    work_id = work.split("/")[-1]  # Extract "W1580997674"
-                                    openalex_referenced_works.append(work_id)
-                                else:
-                                    openalex_referenced_works.append(work)
-                    except Exception as e:
-                        logging.debug(f"Could not get OpenAlex references for {paper_title[:50]}...: {e}")
-            
-            # Fallback: If no DOI/OpenAlex data, try searching by title
-            if openalex_data is None and authors_names:
-                try:
-                    institutions_list = self.openalex_client.get_institutions_by_title(paper_title, authors_names)
-                    if institutions_list:
-                        auth_list = []
-                        for idx, author in enumerate(authors_names):
-                            institutions = institutions_list[idx] if idx < len(institutions_list) else None
-                            auth_list.append({'Author': author, 'Institutions': institutions})
-                        openalex_data = auth_list
-                except Exception as e:
-                    logging.debug(f"Could not find institutions by title for {paper_title[:50]}...: {e}")
-            
-            if openalex_data is None:
-                auth_list = []
-                for author in authors_names:
-                    auth_list.append({'Author': author, 'Institutions': None})
+        if openalex_data is None:
+            openalex_data = [{'Author': author, 'Institutions': None} for author in record.authors]
         
-        authors_and_institutions = openalex_data if openalex_data is not None else auth_list
-        return (self.builder
-                .add_title(paper_title)
-                .add_year(publication_year)
-                .add_doi(doi_number)
-                .add_openalex_link(openalex_link)
-                .add_authors_and_institutions(authors_and_institutions)
+        return (PaperDataBuilder()
+                .add_title(record.title)
+                .add_year(record.year)
+                .add_doi(record.doi)
+                .add_openalex_link(record.openalex_link)
+                .add_authors_and_institutions(openalex_data)
                 .add_referenced_works(openalex_referenced_works)
                 .build())
 
-    
+
+    def __get_openalex_work(self, record):
+        if not record.doi:
+            return self.openalex_works_by_title.get(record.title)
+        if record.doi in self.openalex_works:
+            return self.openalex_works[record.doi]
+        return self.openalex_client.request_by_doi(record.doi)
+
+
     def __filter_paper_title(self, title):
         pattern = r'^(Demo:|Poster:|Welcome Message|Poster Paper:|Demo Paper:)'
         coincidence = re.match(pattern, title)
@@ -2,9 +2,15 @@ from crawler.abstract_crawler import AbstractCrawler
 from utils.file_utils import FileUtils
 from api_clients.factory import APIFactory
 from utils.paper_data_builder import PaperDataBuilder
-from config import CITATIONS_CRAWLER_OUTPUT_DIR, EXTENDED_CRAWLER_OUTPUT_DIR, MAX_WORKERS, ENABLE_PROGRESS_BAR
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.concurrency_controller import get_concurrency_controller
+from utils.single_flight import get_single_flight
+from utils.output_store import get_output_writer, load_stage_data
+from config import (CITATIONS_CRAWLER_OUTPUT_DIR, ENABLE_PROGRESS_BAR,
+                    PIPELINE_QUEUE_SIZE, ASYNC_TASKS)
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import logging
+import queue
 
 try:
     from tqdm import tqdm
@@ -19,22 +25,19 @@ class CitationsCrawler(AbstractCrawler):
         super().__init__(conference, years)
         # inetrnal variables
         self.extended_data = {}
-        self.all_citations_data = {}
-        self.semantic_scholar_citations_data = {}
+        self.paper_years = {}
         # utils and clients
-        self.builder = PaperDataBuilder()
         self.file_utils = FileUtils()
-        self.openalex_client = APIFactory.get_client("openalex")
-        self.semantic_scholar_client = APIFactory.get_client("semantic_scholar")
+        self.output = get_output_writer(conference, "citations")
+        self.openalex_client = APIFactory.get_client("openalex", "citations")
+        self.semantic_scholar_client = APIFactory.get_client("semantic_scholar", "citations")
+        self.concurrency = get_concurrency_controller()
 
 
     def load_data(self):
         print(f"\t> Loading data for {self.conference} from extended data <")
-        extended_data_path = f"{EXTENDED_CRAWLER_OUTPUT_DIR}/{self.conference}_extended_data.json"
-        if self.file_utils.exists(extended_data_path):
-            self.extended_data = self.file_utils.load_json(extended_data_path)
-        else:
-            raise FileNotFoundError(f"Base data not found at {extended_data_path}")
+        # Reads the nested JSON file or the per-year shards, whichever the extended crawl wrote
+        self.extended_data = load_stage_data(self.conference, "extended")
 
     def process_data(self):
         print(f"\t> Processing data for {self.conference} <")
@@ -43,45 +46,108 @@ class CitationsCrawler(AbstractCrawler):
         total_papers = len(paper_citations_ids)
         print(f"\t> Processing citations for {total_papers} papers <")
 
-        # Step 1: Use batch requests for Semantic Scholar API
+        # Stage 1 (this thread) fetches unique cited paperIds in full S2 batches and
+        # hands each citing paper to stage 2 as soon as all its citations are in.
+        # Stage 2 workers enrich them with OpenAlex meanwhile; the bounded queue
+        # keeps S2 from running too far ahead.
+        unique_ids = list(dict.fromkeys(pid for ids in paper_citations_ids.values() for pid in ids))
+        total_citations = sum(len(ids) for ids in paper_citations_ids.values())
+        print(f"\t> {len(unique_ids)} unique cited papers out of {total_citations} citations, "
+              f"enriched with OpenAlex by up to {self.concurrency.max_workers} workers <")
+        
         use_progress = ENABLE_PROGRESS_BAR and HAS_TQDM
-        iterator = paper_citations_ids.items()
+        progress = tqdm(total=total_papers, desc="Processing citations") if use_progress else None
+        ready = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        workers = self.concurrency.max_workers
         
-        if use_progress:
-            iterator = tqdm(iterator, total=total_papers, desc="Fetching citations from S2")
+        def enrich():
+            while True:
+                item = ready.get()
+                if item is None:
+                    return
+                try:
+                    title, cited_data = self.__process_openalex_for_paper(*item)
+                    self.output.add_citations(self.paper_years.get(title), title, cited_data)
+                except Exception as e:
+                    logging.error(f"Error processing citations: {e}")
+                if progress is not None:
+                    progress.update(1)
         
-        for paper_title, citations_ids in iterator:
-            if citations_ids:
-                semantic_scholar_data = self.semantic_scholar_client.batch_request(citations_ids)
-                self.semantic_scholar_citations_data[paper_title] = semantic_scholar_data
-            else:
-                self.semantic_scholar_citations_data[paper_title] = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for _ in range(workers):
+                executor.submit(enrich)
+            try:
+                self.__fetch_citations(paper_citations_ids, unique_ids, ready)
+            finally:
+                for _ in range(workers):
+                    ready.put(None)
+        if progress is not None:
+            progress.close()
+        logging.info(f"Adaptive concurrency limits: {self.concurrency.limits()}")
+        logging.info(f"Coalesced API requests: {get_single_flight().stats()}")
         
-        # Step 2: Process responses concurrently using OpenAlex API for affiliation data
-        print(f"\t> Enriching citation data with OpenAlex ({MAX_WORKERS} workers) <")
+
+    async def aprocess_data(self):
+        """``process_data`` on the event loop with the async clients.
+        
+        Same pipeline, but the enrichment stage is a set of coroutines, so many
+        more papers can wait on OpenAlex at once without a thread each.
+        """
+        print(f"\t> Processing data for {self.conference} (async) <")
+        paper_citations_ids = self.__get_all_papers_ids()
+        unique_ids = list(dict.fromkeys(pid for ids in paper_citations_ids.values() for pid in ids))
+        print(f"\t> {len(unique_ids)} unique cited papers for {len(paper_citations_ids)} papers, "
+              f"enriched with OpenAlex by up to {ASYNC_TASKS} tasks <")
+        
+        use_progress = ENABLE_PROGRESS_BAR and HAS_TQDM
+        progress = tqdm(total=len(paper_citations_ids), desc="Processing citations") if use_progress else None
+        ready = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
         
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            future_to_title = {
-                executor.submit(self.__process_openalex_for_paper, title, response): title
-                for title, response in self.semantic_scholar_citations_data.items()
-            }
+        async with APIFactory.get_async_client("semantic_scholar", "citations") as semantic_scholar, \
+                APIFactory.get_async_client("openalex", "citations") as openalex:
             
-            futures = as_completed(future_to_title)
-            if use_progress:
-                futures = tqdm(futures, total=len(future_to_title), desc="Enriching citations")
+            async def enrich():
+                while True:
+                    item = await ready.get()
+                    if item is None:
+                        return
+                    title, response = item
+                    try:
+                        cited_data = []
+                        if response:
+                            works = await openalex.request_by_dois(self.__get_cited_doi(p) for p in response)
+                            author_institutions = await openalex.prefetch_author_institutions(works.values())
+                            cited_data = self.__build_cited_data(response, works, author_institutions)
+                        # The output writer does file I/O, which must not block the event loop
+                        await asyncio.to_thread(self.output.add_citations, self.paper_years.get(title), title,
+                                                cited_data)
+                    except Exception as e:
+                        logging.error(f"Error processing citations: {e}")
+                    if progress is not None:
+                        progress.update(1)
             
-            for future in futures:
-                try:
-                    title, cited_data = future.result()
-                    self.all_citations_data[title] = cited_data
-                except Exception as e:
-                    logging.error(f"Error processing citations: {e}")
-        
+            workers = [asyncio.create_task(enrich()) for _ in range(ASYNC_TASKS)]
+            try:
+                fan_out = _CitationFanOut(paper_citations_ids)
+                for item in fan_out.without_citations():
+                    await ready.put(item)
+                batch_size = semantic_scholar.BATCH_SIZE
+                for i in range(0, len(unique_ids), batch_size):
+                    batch = unique_ids[i:i + batch_size]
+                    for item in fan_out.add(batch, await semantic_scholar.batch_by_ids(batch)):
+                        await ready.put(item)
+            finally:
+                for _ in workers:
+                    await ready.put(None)
+                await asyncio.gather(*workers)
+        if progress is not None:
+            progress.close()
+        logging.info(f"Adaptive concurrency limits: {self.concurrency.limits()}")
+    
 
     def save_data(self):
         print(f"\t> Saving data for {self.conference} in {CITATIONS_CRAWLER_OUTPUT_DIR} <")
-        filename = f"{self.conference}_citations_data"
-        self.file_utils.add_data_to_existing_file(f"{CITATIONS_CRAWLER_OUTPUT_DIR}/{filename}.json", self.all_citations_data)
+        self.output.commit()
 
 
     def __get_all_papers_ids(self):
@@ -92,6 +158,7 @@ class CitationsCrawler(AbstractCrawler):
                 continue
             for paper in self.extended_data[str(year)]:
                 paper_title = paper["Title"]
+                self.paper_years[paper_title] = str(year)
                 citations = paper.get("Citations")
                 # Accept both legacy and S2 key names
                 if citations is None:
@@ -105,6 +172,24 @@ class CitationsCrawler(AbstractCrawler):
         return paper_citations_ids
     
 
+    def __fetch_citations(self, paper_citations_ids, unique_ids, ready):
+        """Fetch the cited papers from S2 and queue each citing paper once complete.
+        
+        Args:
+            paper_citations_ids: Dict of citing title -> cited paperIds
+            unique_ids: Cited paperIds without duplicates, in citing-paper order
+            ready: Queue receiving (title, cited records) tuples
+        """
+        fan_out = _CitationFanOut(paper_citations_ids)
+        for item in fan_out.without_citations():
+            ready.put(item)
+        batch_size = self.semantic_scholar_client.BATCH_SIZE
+        for i in range(0, len(unique_ids), batch_size):
+            batch = unique_ids[i:i + batch_size]
+            for item in fan_out.add(batch, self.semantic_scholar_client.batch_by_ids(batch)):
+                ready.put(item)
+    
+
     def __process_openalex_for_paper(self, title, response):
         """Process citations for a paper using OpenAlex to get affiliation data.
         
@@ -115,18 +200,34 @@ class CitationsCrawler(AbstractCrawler):
         Returns:
             Tuple of (title, cited_data)
         """
-        cited_data = []
-        
         if not response:
-            return (title, cited_data)
+            return (title, [])
+        
+        # Resolve every cited DOI of this paper in batches of 50 up front
+        openalex_works = self.openalex_client.request_by_dois(self.__get_cited_doi(p) for p in response)
+        author_institutions = self.openalex_client.prefetch_author_institutions(openalex_works.values())
+        return (title, self.__build_cited_data(response, openalex_works, author_institutions))
+    
+
+    def __build_cited_data(self, response, openalex_works, author_institutions):
+        """Build the records of one paper's cited papers from already fetched OpenAlex data.
         
+        Args:
+            response: List of cited papers from Semantic Scholar
+            openalex_works: Dict of DOI -> OpenAlex work for the cited papers
+            author_institutions: Fallback institutions of their authors
+            
+        Returns:
+            List of cited paper dicts
+        """
+        cited_data = []
         for cited_paper in response:
             try:
-                external_ids = cited_paper.get("externalIds", {})
-                doi = external_ids.get("DOI") if external_ids else None
+                doi = self.__get_cited_doi(cited_paper)
                 
                 if doi:
-                    openalex_data = self.openalex_client.get_paper_authors_and_affiliations_doi(doi)
+                    openalex_data = self.openalex_client.get_authors_and_affiliations_from_work(
+                        openalex_works.get(doi), author_institutions=author_institutions)
                     year_value = str(cited_paper.get("year")) if cited_paper.get("year") else None
                     title_value = cited_paper.get("title")
 
@@ -150,7 +251,7 @@ class CitationsCrawler(AbstractCrawler):
 
                     # Require title and year for builder; allow authors None
                     if title_value and year_value:
-                        paper_data = (self.builder
+                        paper_data = (PaperDataBuilder()
                                         .add_title(title_value)
                                         .add_year(year_value)
                                         .add_doi(doi)
@@ -167,4 +268,53 @@ class CitationsCrawler(AbstractCrawler):
                 logging.error(f"Error processing cited paper: {e}")
                 continue
         
-        return (title, cited_data)
+        return cited_data
+    
+
+    def __get_cited_doi(self, cited_paper):
+        if not cited_paper:
+            return None
+        external_ids = cited_paper.get("externalIds", {})
+        return external_ids.get("DOI") if external_ids else None
+
+
+class _CitationFanOut:
+    """Tracks which citing papers have all their cited records fetched.
+    
+    Records are released once every citing paper that needs them has been
+    handed out, so memory is bounded by the unfinished papers, not the crawl.
+    """
+    
+    def __init__(self, paper_citations_ids):
+        self.paper_citations_ids = paper_citations_ids
+        self.records = {}
+        self.waiting_on = {}
+        self.pending = {}
+        for title, ids in paper_citations_ids.items():
+            if ids:
+                self.pending[title] = set(ids)
+                for paper_id in self.pending[title]:
+                    self.waiting_on.setdefault(paper_id, []).append(title)
+        self.users = {paper_id: len(titles) for paper_id, titles in self.waiting_on.items()}
+    
+    def without_citations(self):
+        """(title, []) for every citing paper with nothing to fetch."""
+        return [(title, []) for title, ids in self.paper_citations_ids.items() if not ids]
+    
+    def add(self, batch, records):
+        """Record a fetched batch and return the (title, cited records) now complete."""
+        self.records.update(records)
+        completed = []
+        for paper_id in batch:
+            for title in self.waiting_on.pop(paper_id, []):
+                self.pending[title].discard(paper_id)
+                if self.pending[title]:
+                    continue
+                del self.pending[title]
+                ids = self.paper_citations_ids[title]
+                completed.append((title, [self.records.get(pid) for pid in ids]))
+                for pid in set(ids):
+                    self.users[pid] -= 1
+                    if not self.users[pid]:
+                        self.records.pop(pid, None)
+        return completed
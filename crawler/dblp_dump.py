@@ -0,0 +1,44 @@
+import gzip
+import logging
+from lxml import etree
+from crawler.dblp_parser import parse_xml_entry, release_element
+
+DBLP_URL = "https://dblp.org/"
+# Top-level record types of dblp.xml; all of them are cleared as the dump streams by
+RECORD_TAGS = ("article", "inproceedings", "proceedings", "book", "incollection",
+               "phdthesis", "mastersthesis", "www", "person", "data")
+PAPER_TAGS = ("inproceedings",)
+
+
+def read_dump_records(dump_path, accept_link):
+    """Stream the papers of a DBLP XML dump whose proceedings page passes ``accept_link``.
+
+    ``dblp.dtd`` must sit next to the dump: it defines the character entities
+    used in names and titles. Every record is cleared once read, so memory
+    stays flat however large the dump is.
+
+    Args:
+        dump_path: Path to ``dblp.xml.gz`` (or an uncompressed ``dblp.xml``)
+        accept_link: Called with the HTML URL of an entry's proceedings page
+                     (e.g. https://dblp.org/db/conf/osdi/osdi2023.html)
+
+    Yields:
+        Tuples (proceedings page URL, DblpRecord)
+    """
+    parsed = 0
+    opener = gzip.open if str(dump_path).endswith(".gz") else open
+    # The file object's name is the dump's path, which lxml uses to resolve the relative DTD
+    with opener(dump_path, "rb") as dump:
+        for _, element in etree.iterparse(dump, events=("end",), tag=RECORD_TAGS,
+                                          load_dtd=True, resolve_entities=True, no_network=True,
+                                          huge_tree=True):
+            if element.tag in PAPER_TAGS:
+                url = element.findtext("url")
+                if url:
+                    link = DBLP_URL + url.split("#")[0]
+                    if accept_link(link):
+                        yield link, parse_xml_entry(element)
+            release_element(element)
+            parsed += 1
+            if parsed % 1000000 == 0:
+                logging.info(f"Read {parsed} DBLP dump records")
@@ -0,0 +1,184 @@
+import io
+import re
+from functools import lru_cache
+from bs4 import BeautifulSoup
+from lxml import etree
+from config import SKIP_SECTIONS
+
+OPENALEX_DOI_URL = "https://api.openalex.org/works/doi:"
+# DBLP tells homonyms apart with a 4-digit suffix ("Wei Wang 0001") that the HTML pages do not show
+AUTHOR_DISAMBIGUATION = re.compile(r"\s+\d{4}$")
+
+
+class DblpRecord:
+    """Plain data extracted from one DBLP entry.
+
+    Holds only strings, so the parsed page can be freed as soon as its
+    records are extracted.
+    """
+    __slots__ = ("title", "year", "authors", "doi", "openalex_link")
+
+    def __init__(self, title, year, authors, doi=None, openalex_link=None):
+        self.title = title
+        self.year = year
+        self.authors = authors
+        self.doi = doi
+        self.openalex_link = openalex_link
+
+    def __repr__(self):
+        return f"DblpRecord({self.title!r}, {self.year!r}, doi={self.doi!r})"
+
+
+def parse_year_page(page, skip_sections=SKIP_SECTIONS):
+    """Extract the records of a DBLP proceedings page, leaving out skipped sections.
+
+    The page is walked once in document order, keeping the latest h2, h3 and
+    h4 seen. Like ``find_previous``, a header stays in effect until another
+    header of the same level replaces it.
+
+    Args:
+        page: HTML of the page
+        skip_sections: Header fragments (e.g. "workshop") whose papers are ignored
+
+    Returns:
+        List of DblpRecord
+    """
+    matcher = compile_section_matcher(tuple(skip_sections))
+    skipped = {"h2": False, "h3": False, "h4": False}
+    records = []
+    soup = BeautifulSoup(page, features="lxml")
+    for element in soup.find_all(["h2", "h3", "h4", "ul"]):
+        if element.name != "ul":
+            text = element.get_text().lower().replace('\n', '')
+            skipped[element.name] = matcher is not None and matcher.search(text) is not None
+        elif "publ-list" in element.get("class", ()) and not any(skipped.values()):
+            for article in element.find_all('li', {'itemtype': 'http://schema.org/ScholarlyArticle'}):
+                records.append(parse_article(article))
+    soup.decompose()
+    return records
+
+
+def parse_year_xml(page, skip_sections=SKIP_SECTIONS):
+    """Extract the records of a DBLP proceedings TOC in XML (the page's ``.xml`` export).
+
+    Sections are tracked exactly like ``parse_year_page`` does. The document is
+    streamed with ``iterparse`` and each entry is dropped once its record is built.
+
+    Args:
+        page: XML of the TOC, as text or bytes
+        skip_sections: Header fragments (e.g. "workshop") whose papers are ignored
+
+    Returns:
+        List of DblpRecord
+    """
+    matcher = compile_section_matcher(tuple(skip_sections))
+    skipped = {"h2": False, "h3": False, "h4": False}
+    records = []
+    if isinstance(page, str):
+        # requests already decoded the body; whatever the declaration says, these bytes are UTF-8
+        source, encoding = io.BytesIO(page.encode("utf-8")), "utf-8"
+    else:
+        source, encoding = io.BytesIO(page), None
+    for _, element in etree.iterparse(source, events=("end",), tag=("h2", "h3", "h4", "inproceedings"),
+                                      encoding=encoding, recover=True):
+        if element.tag == "inproceedings":
+            if not any(skipped.values()):
+                records.append(parse_xml_entry(element))
+        else:
+            text = "".join(element.itertext()).lower().replace('\n', '')
+            skipped[element.tag] = matcher is not None and matcher.search(text) is not None
+        release_element(element)
+    return records
+
+
+def parse_xml_entry(entry):
+    """Build a DblpRecord from a DBLP XML publication element (``inproceedings``, ``article``...)."""
+    authors_names = []
+    for author in entry.iterfind("author"):
+        author_name = AUTHOR_DISAMBIGUATION.sub("", "".join(author.itertext()).strip())
+        if author_name not in authors_names:
+            authors_names.append(author_name)
+    title = entry.find("title")
+    paper_title = "".join(title.itertext()) if title is not None else 'nothing'
+    doi_number = next((doi for doi in (doi_from_url(ee.text) for ee in entry.iterfind("ee")) if doi), None)
+    openalex_link = f"{OPENALEX_DOI_URL}{doi_number}" if doi_number else None
+    return DblpRecord(paper_title, entry.findtext("year"), authors_names, doi_number, openalex_link)
+
+
+def release_element(element):
+    """Free an ``iterparse`` element and the already handled siblings of its ancestors."""
+    element.clear(keep_tail=True)
+    while element is not None:
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+        element = element.getparent()
+
+
+@lru_cache(maxsize=8)
+def compile_section_matcher(skip_sections):
+    """One case-insensitive regex matching any of the ``skip_sections`` fragments."""
+    if not skip_sections:
+        return None
+    return re.compile("|".join(re.escape(section.lower()) for section in skip_sections))
+
+
+def parse_article(article):
+    """Build a DblpRecord from a ``li`` ScholarlyArticle element."""
+    publication_year = None
+    paper_title = 'nothing'
+    authors_names = []
+    doi_number, openalex_link = None, None
+    for content_item in article.contents:
+        class_of_content_item = content_item.attrs.get('class', [0])
+        if 'data' in class_of_content_item:
+            # get the paper title from dblp
+            paper_title = content_item.find('span', attrs={"class": "title", "itemprop": "name"}).text
+            # get the publication year from dblp
+            for datePublished in content_item.findAll('span', attrs={"itemprop": "datePublished"}):
+                publication_year = datePublished.text
+            if publication_year is None:
+                publication_year = content_item.find('meta', attrs={"itemprop": "datePublished"}).get("content")
+            # get the author's names from dblp paper
+            for author in content_item.findAll('span', attrs={"itemprop": "author"}):
+                author_name = author.text
+                if author_name not in authors_names:
+                    authors_names.append(author_name)
+        if 'publ' in class_of_content_item:
+            doi_number, openalex_link = get_doi_and_openalex_link(content_item)
+    return DblpRecord(str(paper_title), publication_year, authors_names, doi_number, openalex_link)
+
+
+def get_doi_and_openalex_link(publ_item):
+    # Search for links in the entire element, not just contents[0]
+    links = publ_item.findAll("a")
+
+    # Extract OpenAlex link
+    openalex_link = [l.get("href") for l in links if l.get("href") and "openalex" in l.get("href")]
+    openalex_link = openalex_link[0] if openalex_link else None
+
+    # Extract DOI - Try multiple sources for maximum coverage
+    doi_number = None
+
+    # Strategy 1: Direct DOI link from DBLP (MOST COMMON)
+    doi_links = [l.get("href") for l in links if l.get("href") and "doi.org" in l.get("href")]
+    if doi_links:
+        doi_number = doi_from_url(doi_links[0])
+
+    # Strategy 2: Extract from OpenAlex link (if no direct DOI)
+    elif openalex_link and "doi:" in openalex_link:
+        doi_number = openalex_link.replace(OPENALEX_DOI_URL, "")
+
+    return doi_number, openalex_link
+
+
+def doi_from_url(url):
+    """The DOI of a doi.org link, or None for any other link."""
+    if not url or "doi.org" not in url:
+        return None
+    # Clean DOI from URL
+    doi_number = url.replace("https://doi.org/", "").replace("http://doi.org/", "")
+    doi_number = doi_number.replace("https://dx.doi.org/", "").replace("http://dx.doi.org/", "")
+    # Remove any trailing query parameters
+    if '?' in doi_number:
+        doi_number = doi_number.split('?')[0]
+    return doi_number
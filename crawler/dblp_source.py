@@ -0,0 +1,190 @@
+import logging
+import re
+from abc import ABC, abstractmethod
+from bs4 import BeautifulSoup
+from crawler.dblp_dump import read_dump_records
+from crawler.dblp_parser import parse_year_page, parse_year_xml
+from config import SKIP_SECTIONS, DBLP_SOURCE, DBLP_DUMP_PATH
+
+
+def dblp_names(conference):
+    """DBLP directory and file prefix of a conference's proceedings pages."""
+    # Special cases for conference naming in DBLP
+    if conference == "cloud":
+        return "cloud", "socc"
+    if conference == "atc":
+        # ATC is under usenix directory in DBLP
+        return "usenix", "usenix"
+    return conference, conference
+
+
+def is_proceedings_link(conference, link):
+    directory, conf_pattern = dblp_names(conference)
+
+    # Pattern accepts both single volume (europar2024.html) and multiple volumes (europar2024-1.html)
+    # but excludes workshops (europar2024w1.html)
+    pattern = rf"https://dblp.org/db/conf/{directory}/{conf_pattern}\d{{4}}(-\d+)?\.html"
+
+    # Additional check: exclude workshop links (containing 'w' before digit)
+    if re.search(r'\d{{4}}w\d+\.html', link):
+        return False
+
+    return bool(re.match(pattern, link))
+
+
+def select_year_links(conference, links, first_year, last_year):
+    """The conference's proceedings pages among ``links`` for the given years, sorted."""
+    return sorted(link for link in links if is_proceedings_link(conference, link) and
+                  any(str(year) in link for year in range(first_year, last_year + 1)))
+
+
+class DblpSource(ABC):
+    """Where the base crawler gets the papers of one DBLP proceedings page."""
+
+    def __init__(self, dblp_client, skip_sections=SKIP_SECTIONS):
+        self.dblp_client = dblp_client
+        self.skip_sections = skip_sections
+
+    def get_year_links(self, conference, first_year, last_year):
+        """URLs of the conference's proceedings pages, read from its DBLP index page."""
+        return select_year_links(conference, self.__get_index_links(conference), first_year, last_year)
+
+    def __get_index_links(self, conference):
+        directory, _ = dblp_names(conference)
+        url = "https://dblp.org/db/conf/" + directory + "/"
+        html_page = self.dblp_client.get_page(url)
+        if html_page is None:
+            logging.error(f"Could not download DBLP index {url}")
+            return set()
+        soup = BeautifulSoup(html_page, 'html.parser')
+        link_list = set()
+        for link_elem in soup.findAll('a'):
+            link = link_elem.get('href')
+            if link and url in link:  # to avoid repeated links
+                link_list.add(link)
+        return link_list  # list with all the papers for each year
+
+    @abstractmethod
+    def get_records(self, link):
+        """Records of the proceedings page ``link`` outside skipped sections.
+
+        Args:
+            link: URL of the HTML proceedings page, as listed in the conference index
+
+        Returns:
+            List of DblpRecord, or None if the page could not be downloaded
+        """
+
+
+class HtmlDblpSource(DblpSource):
+    """Scrapes the proceedings page itself."""
+
+    def get_records(self, link):
+        page = self.dblp_client.get_page(link)
+        if page is None:
+            return None
+        return parse_year_page(page, self.skip_sections)
+
+
+class XmlDblpSource(DblpSource):
+    """Reads DBLP's XML export of the proceedings table of contents.
+
+    The export carries the same entries and headers as the HTML page without
+    the presentation markup, so it is cheaper to parse and does not depend on
+    DBLP's page layout.
+    """
+
+    def get_records(self, link):
+        page = self.dblp_client.get_page(self.xml_url(link))
+        if page is None:
+            return None
+        return parse_year_xml(page, self.skip_sections)
+
+    @staticmethod
+    def xml_url(link):
+        return re.sub(r"\.html(#.*)?$", ".xml", link)
+
+
+class DumpDblpSource(DblpSource):
+    """Serves pages from a local copy of the full DBLP dump, without any DBLP request.
+
+    Only the papers of the requested conferences are kept, grouped by
+    proceedings page. ``ingest`` reads several conferences in one pass over
+    the dump, and ``get_dblp_source`` shares one instance per dump across
+    crawlers, so a multi-conference run streams the dump once. Entries in the
+    dump carry no session headers, so ``skip_sections`` cannot be applied:
+    rather than silently keeping keynotes, posters or demos, the source
+    refuses to run unless ``skip_sections`` is empty. Workshop volumes are
+    still left out by their URL.
+
+    Raises:
+        ValueError: If ``skip_sections`` is not empty
+    """
+
+    def __init__(self, dblp_client=None, skip_sections=SKIP_SECTIONS, dump_path=DBLP_DUMP_PATH):
+        if skip_sections:
+            message = ("The DBLP dump has no proceedings sections, so skip_sections cannot be applied; "
+                       "set crawler_config.skip_sections = [] to crawl from the dump, or use the 'html' or "
+                       "'xml' DBLP source")
+            logging.error(message)
+            raise ValueError(message)
+        super().__init__(dblp_client, skip_sections)
+        self.dump_path = dump_path
+        self.records_by_link = {}
+        self.ingested = set()
+
+    def get_year_links(self, conference, first_year, last_year):
+        self.ingest([conference])
+        return select_year_links(conference, self.records_by_link, first_year, last_year)
+
+    def get_records(self, link):
+        return self.records_by_link.get(link)
+
+    def ingest(self, conferences):
+        """Read the papers of every conference not read yet, in a single pass over the dump."""
+        pending = [conference for conference in dict.fromkeys(conferences) if conference not in self.ingested]
+        if not pending:
+            return
+        print(f"\t> Reading {', '.join(pending)} papers from the DBLP dump {self.dump_path} <")
+        # Pages already read for another conference of the same DBLP directory are not added twice
+        known_links = set(self.records_by_link)
+        accept_link = lambda link: link not in known_links and \
+            any(is_proceedings_link(conference, link) for conference in pending)
+        for link, record in read_dump_records(self.dump_path, accept_link):
+            self.records_by_link.setdefault(link, []).append(record)
+        self.ingested.update(pending)
+
+
+DBLP_SOURCES = {
+    "html": HtmlDblpSource,
+    "xml": XmlDblpSource,
+    "dump": DumpDblpSource,
+}
+
+# Dump sources are shared so that each dump is streamed once per process
+_dump_sources = {}
+
+
+def get_dblp_source(dblp_client, name=DBLP_SOURCE, skip_sections=SKIP_SECTIONS):
+    """Create the DBLP source configured by ``crawler_config.dblp_source``.
+
+    The dump source is shared by every crawler of the process.
+    """
+    if name not in DBLP_SOURCES:
+        raise ValueError(f"Invalid DBLP source '{name}', expected one of {sorted(DBLP_SOURCES)}")
+    if name == "dump":
+        if DBLP_DUMP_PATH not in _dump_sources:
+            _dump_sources[DBLP_DUMP_PATH] = DumpDblpSource(dblp_client, skip_sections)
+        return _dump_sources[DBLP_DUMP_PATH]
+    return DBLP_SOURCES[name](dblp_client, skip_sections)
+
+
+def preload_dblp_source(conferences, crawler_types=("base",), name=DBLP_SOURCE):
+    """Read the papers of all ``conferences`` up front when the base crawler reads the dump.
+
+    Every entry point that crawls several conferences calls this before its
+    crawl loop, so the dump is streamed once. Other sources fetch pages on
+    demand, and the later stages do not read DBLP, so then this does nothing.
+    """
+    if name == "dump" and "base" in crawler_types:
+        get_dblp_source(None, name).ingest(conferences)
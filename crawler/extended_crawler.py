@@ -2,10 +2,16 @@ from crawler.abstract_crawler import AbstractCrawler
 from utils.file_utils import FileUtils
 from api_clients.factory import APIFactory
 from utils.paper_data_builder import PaperDataBuilder
-from config import BASE_CRAWLER_OUTPUT_DIR, EXTENDED_CRAWLER_OUTPUT_DIR, MAX_WORKERS, ENABLE_PROGRESS_BAR
+from utils.concurrency_controller import get_concurrency_controller
+from utils.single_flight import get_single_flight
+from config import EXTENDED_CRAWLER_OUTPUT_DIR, ENABLE_PROGRESS_BAR, OPENALEX_VENUE_SOURCES
 from fuzzywuzzy import fuzz
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.stage_scheduler import StageScheduler, StageTask
+from utils.work_matcher import WorkMatcher
+from utils.citation_checkpoints import get_citation_checkpoints
+from utils.output_store import get_output_writer, load_stage_data
 import unicodedata
+import threading
 import logging
 
 try:
@@ -21,23 +27,23 @@ class ExtendedCrawler(AbstractCrawler):
         print("----------------- [Extended Crawler] -----------------")
         super().__init__(conference, years)
         # internal variables
-        self.data_per_year = {}
         self.base_data = {}
+        self.semantic_scholar_papers = {}
+        self.openalex_works = {}
+        self.paged_citations = set()
         # utils and clients
-        self.builder = PaperDataBuilder()
         self.file_utils = FileUtils()
-        self.openalex_client = APIFactory.get_client("openalex")
-        self.semantic_scholar_client = APIFactory.get_client("semantic_scholar")
+        self.output = get_output_writer(conference, "extended")
+        self.openalex_client = APIFactory.get_client("openalex", "extended")
+        self.semantic_scholar_client = APIFactory.get_client("semantic_scholar", "extended")
+        self.concurrency = get_concurrency_controller()
         self.crossref_client = APIFactory.get_client("crossref")
 
 
     def load_data(self):
         print(f"\t> Loading data for {self.conference} from base data <")
-        base_data_path = f"{BASE_CRAWLER_OUTPUT_DIR}/{self.conference}_base_data.json"
-        if self.file_utils.exists(base_data_path):
-            self.base_data = self.file_utils.load_json(base_data_path)
-        else:
-            raise FileNotFoundError(f"Base data not found at {base_data_path}")
+        # Reads the nested JSON file or the per-year shards, whichever the base crawl wrote
+        self.base_data = load_stage_data(self.conference, "base")
 
     def process_data(self):
         print(f"\t> Processing data for {self.conference} <")
@@ -51,115 +57,184 @@ class ExtendedCrawler(AbstractCrawler):
             for paper in self.base_data[str(year)]:
                 papers_to_process.append((str(year), paper))
         
-        print(f"\t> Processing {len(papers_to_process)} papers with {MAX_WORKERS} workers <")
+        # Resolve every DOI in Semantic Scholar up front with batch requests
+        dois = [paper.get("DOI Number") for _, paper in papers_to_process]
+        self.semantic_scholar_papers = self.semantic_scholar_client.batch_by_dois(dois)
+        print(f"\t> Resolved {sum(1 for p in self.semantic_scholar_papers.values() if p)} DOIs in Semantic Scholar <")
+        self.openalex_works = self.__harvest_openalex(dois)
+        
+        print(f"\t> Processing {len(papers_to_process)} papers with up to {self.concurrency.max_workers} "
+              f"workers per API <")
         
         # Use progress bar if available
         use_progress = ENABLE_PROGRESS_BAR and HAS_TQDM
+        progress = tqdm(total=len(papers_to_process), desc="Processing papers") if use_progress else None
+        results_lock = threading.Lock()
         
-        # Process papers concurrently
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            # Submit all tasks
-            future_to_paper = {
-                executor.submit(self.__process_single_paper, year, paper): (year, paper)
-                for year, paper in papers_to_process
-            }
+        def on_complete(job_id, results):
+            year, paper = papers_to_process[job_id]
+            paper_data = self.__build_paper_data(year, paper, results)
+            if paper_data:
+                self.output.add_paper(year, paper_data)
+            with results_lock:
+                if progress is not None:
+                    progress.update(1)
+        
+        # Each API has its own queue and workers: a paper's OpenAlex step is queued
+        # as soon as its S2 step is done, and never waits behind the S2 limiter.
+        workers = {"semantic_scholar": self.concurrency.max_workers, "openalex": self.concurrency.max_workers}
+        try:
+            with StageScheduler(workers) as scheduler:
+                for job_id, (year, paper) in enumerate(papers_to_process):
+                    try:
+                        tasks = self.__paper_tasks(year, paper)
+                    except Exception as e:
+                        logging.error(f"Error processing paper '{paper.get('Title', 'Unknown')}': {e}")
+                        if progress is not None:
+                            progress.update(1)
+                        continue
+                    scheduler.submit(job_id, tasks, on_complete)
+        finally:
+            if progress is not None:
+                progress.close()
+        logging.info(f"Adaptive concurrency limits: {self.concurrency.limits()}")
+        logging.info(f"Coalesced API requests: {get_single_flight().stats()}")
+    
+    def __harvest_openalex(self, dois):
+        """Works of the venue's OpenAlex harvest for ``dois``, when its OpenAlex sources are configured.
+        
+        Only DOIs are matched: this stage does not fall back to titles.
+        
+        Returns:
+            Dict of DOI -> OpenAlex work for the DOIs found
+        """
+        source_ids = OPENALEX_VENUE_SOURCES.get(self.conference)
+        if not source_ids:
+            return {}
+        harvested = WorkMatcher(self.openalex_client.harvest_venue(source_ids, self.first_year, self.last_year))
+        works = {doi: harvested.match(doi) for doi in dois if doi}
+        works = {doi: work for doi, work in works.items() if work is not None}
+        print(f"\t> Matched {len(works)} DOIs in the venue's OpenAlex works <")
+        return works
+    
+    def __paper_tasks(self, year, paper):
+        """Split the enrichment of one paper into per-API stage tasks.
+        
+        Args:
+            year: Publication year
+            paper: Paper data from base crawler
             
-            # Collect results with optional progress bar
-            futures = as_completed(future_to_paper)
-            if use_progress:
-                futures = tqdm(futures, total=len(future_to_paper), desc="Processing papers")
+        Returns:
+            List of StageTasks: the S2 lookup, then the OpenAlex lookup
+        """
+        doi = paper.get("DOI Number")
+        
+        def semantic_scholar_stage(_):
+            # Get data from Semantic Scholar (ONLY by DOI)
+            semantic_scholar_data = self.__get_semantic_scholar_data(doi)
+            if semantic_scholar_data and "data" in semantic_scholar_data:
+                semantic_scholar_data = semantic_scholar_data['data'][0]
+            return self.__complete_citations(year, semantic_scholar_data)
+        
+        def openalex_stage(results):
+            # Papers unknown to S2 are not saved, so OpenAlex is not asked about them
+            if not results["semantic_scholar"] or not doi:
+                return None
+            work = self.openalex_works.get(doi) or self.openalex_client.request_by_doi(doi)
+            if work is None:
+                return None
+            authors = None
+            # Affiliations are only needed when the base crawler had no OpenAlex link
+            if paper.get("OpenAlex Link") is None and paper.get("Authors and Institutions"):
+                authors = self.openalex_client.get_authors_and_affiliations_from_work(work)
+            return {"authors": authors, "referenced_works": work.get("referenced_works")}
+        
+        return [
+            StageTask("semantic_scholar", "semantic_scholar", semantic_scholar_stage),
+            StageTask("openalex", "openalex", openalex_stage, depends_on=("semantic_scholar",)),
+        ]
+    
+    def __complete_citations(self, year, semantic_scholar_data):
+        """Page through the citations of a highly cited paper, whose inline list S2 truncates.
+        
+        Pages are handed to the output writer as they arrive, which saves them
+        next to the paper and, on load, puts them in place of the truncated
+        inline list kept in "Citations S2".
+        
+        Args:
+            year: Publication year
+            semantic_scholar_data: S2 paper record, or None
             
-            for future in futures:
-                try:
-                    year, paper_data = future.result()
-                    if not paper_data:
-                        continue
-                    # Normalize to dict for JSON serialization
-                    if hasattr(paper_data, 'to_dict'):
-                        record = paper_data.to_dict()
-                    elif isinstance(paper_data, dict):
-                        record = paper_data
-                    else:
-                        logging.error("Unsupported paper_data type; skipping")
-                        continue
-                    if year not in self.data_per_year:
-                        self.data_per_year[year] = []
-                    self.data_per_year[year].append(record)
-                except Exception as e:
-                    logging.error(f"Error processing paper: {e}")
+        Returns:
+            The record, unchanged
+        """
+        if not semantic_scholar_data:
+            return semantic_scholar_data
+        paper_id = semantic_scholar_data.get("paperId")
+        inline_citations = semantic_scholar_data.get("citations") or []
+        citation_count = semantic_scholar_data.get("citationCount") or 0
+        # Only a list that reached the inline limit was cut off; a shorter one is all S2 has
+        truncated = len(inline_citations) >= self.semantic_scholar_client.INLINE_CITATIONS_LIMIT
+        if not paper_id or not truncated or citation_count <= len(inline_citations):
+            return semantic_scholar_data
+        complete = self.semantic_scholar_client.get_all_citations(
+            paper_id, citation_count,
+            lambda offset, citing_papers: self.output.add_citation_page(year, paper_id, offset, citing_papers),
+            checkpoints=get_citation_checkpoints())
+        if complete:
+            # Checkpoints of papers with failed pages are kept for the next run
+            self.paged_citations.add(paper_id)
+        return semantic_scholar_data
     
-    def __process_single_paper(self, year, paper):
-        """Process a single paper and return its data.
+    def __build_paper_data(self, year, paper, results):
+        """Join the stage results of a paper into its extended record.
         
         Args:
             year: Publication year
             paper: Paper data from base crawler
+            results: Dict of stage name -> stage result
             
         Returns:
-            Tuple of (year, paper_data)
+            Paper dict, or None if Semantic Scholar does not know the paper
         """
         try:
+            semantic_scholar_data = results["semantic_scholar"]
+            if not semantic_scholar_data:
+                return None
+            openalex_data = results["openalex"] or {}
+            
             title = paper["Title"]
-            doi = paper["DOI Number"]
-            openalex_link = paper["OpenAlex Link"]
             authors_affiliations = paper["Authors and Institutions"]  # FROM DBLP - NEVER MODIFY
             
-            # Get data from Semantic Scholar (ONLY by DOI)
-            semantic_scholar_data = self.__get_semantic_scholar_data(doi)
-            
             enriched_authors = None
-            semantic_scholar_doi = None
+            if openalex_data.get("authors"):
+                enriched_authors = self._merge_institutions_only(authors_affiliations, openalex_data["authors"])
+                logging.info(f"Found via OpenAlex DOI: {title[:50]}...")
             
-            if semantic_scholar_data:
-                if "data" in semantic_scholar_data:
-                    semantic_scholar_data = semantic_scholar_data['data'][0]
-                
-                # Try to get affiliation data if OpenAlex link is missing (ONLY via DOI)
-                if openalex_link is None and authors_affiliations and doi:
-                    openalex_data = self.openalex_client.get_paper_authors_and_affiliations_doi(doi)
-                    if openalex_data:
-                        enriched_authors = self._merge_institutions_only(authors_affiliations, openalex_data)
-                        logging.info(f"Found via OpenAlex DOI: {title[:50]}...")
-                
-                # Use enriched authors if available, otherwise keep original DBLP data
-                final_authors = enriched_authors if enriched_authors else authors_affiliations
-                
-                # Safely get TLDR
-                tldr_obj = semantic_scholar_data.get("tldr")
-                tldr_text = tldr_obj.get("text") if tldr_obj else None
-                
-                # Get S2 Paper ID for additional queries
-                s2_paper_id = semantic_scholar_data.get("paperId")
-                
-                # Get OpenAlex Referenced Works
-                openalex_referenced_works = None
-                if doi or openalex_link:
-                    try:
-                        openalex_referenced_works = self.openalex_client.get_referenced_works(doi=doi)
-                    except Exception as e:
-                        logging.debug(f"Could not get OpenAlex references for {title[:50]}...: {e}")
-                
-                citations_s2 = semantic_scholar_data.get("citations")
-                
-                preferred_doi = doi
-                paper_data = (self.builder
-                            .add_title(title)
-                            .add_year(year)
-                            .add_doi(preferred_doi)
-                            .add_openalex_link(openalex_link)
-                            .add_authors_and_institutions(final_authors)
-                            .add_field("S2 Paper ID", s2_paper_id)
-                            .add_abstract(semantic_scholar_data.get("abstract"))
-                            .add_field("TLDR", tldr_text)
-                            .add_referenced_works(openalex_referenced_works)
-                            .add_citations_s2(citations_s2)
-                            .build())
-                return (year, paper_data)
+            # Use enriched authors if available, otherwise keep original DBLP data
+            final_authors = enriched_authors if enriched_authors else authors_affiliations
+            
+            # Safely get TLDR
+            tldr_obj = semantic_scholar_data.get("tldr")
+            tldr_text = tldr_obj.get("text") if tldr_obj else None
             
-            return (year, None)
+            paper_data = (PaperDataBuilder()
+                        .add_title(title)
+                        .add_year(year)
+                        .add_doi(paper.get("DOI Number"))
+                        .add_openalex_link(paper.get("OpenAlex Link"))
+                        .add_authors_and_institutions(final_authors)
+                        .add_field("S2 Paper ID", semantic_scholar_data.get("paperId"))
+                        .add_abstract(semantic_scholar_data.get("abstract"))
+                        .add_field("TLDR", tldr_text)
+                        .add_referenced_works(openalex_data.get("referenced_works"))
+                        .add_citations_s2(semantic_scholar_data.get("citations"))
+                        .build())
+            # Normalize to dict for JSON serialization
+            return paper_data.to_dict() if hasattr(paper_data, 'to_dict') else paper_data
         except Exception as e:
             logging.error(f"Error processing paper '{paper.get('Title', 'Unknown')}': {e}")
-            return (year, None)
+            return None
 
 
     def _merge_institutions_only(self, dblp_authors, openalex_data):
@@ -278,8 +353,10 @@ class ExtendedCrawler(AbstractCrawler):
 
     def save_data(self):
         print(f"\t> Saving data for {self.conference} in {EXTENDED_CRAWLER_OUTPUT_DIR} <")
-        filename = f"{self.conference}_extended_data"
-        self.file_utils.add_data_to_existing_file(f"{EXTENDED_CRAWLER_OUTPUT_DIR}/{filename}.json", self.data_per_year)
+        self.output.commit()
+        # The papers whose pages were all fetched are in the output now
+        for paper_id in self.paged_citations:
+            get_citation_checkpoints().clear(paper_id)
 
 
     def __get_semantic_scholar_data(self, doi):
@@ -293,6 +370,8 @@ class ExtendedCrawler(AbstractCrawler):
         """
         if not doi:
             return None
+        if doi in self.semantic_scholar_papers:
+            return self.semantic_scholar_papers[doi]
         data = self.semantic_scholar_client.request_by_doi(doi)
         if data:
             return data
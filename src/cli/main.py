@@ -1,4 +1,5 @@
 import argparse
+import asyncio
 import sys
 import logging
 from typing import List, Tuple
@@ -11,6 +12,7 @@ sys.path.insert(0, str(project_root))
 from crawler.base_crawler import BaseCrawler
 from crawler.extended_crawler import ExtendedCrawler
 from crawler.citations_crawler import CitationsCrawler
+from crawler.dblp_source import preload_dblp_source
 from src.config.settings import logging_config
 
 
@@ -56,7 +58,7 @@ def validate_conferences(conferences: List[str]) -> List[str]:
     return conferences
 
 
-def run_crawler(conference: str, years: Tuple[int, int], crawler_type: str):
+def run_crawler(conference: str, years: Tuple[int, int], crawler_type: str, use_async: bool = False):
     logger = logging.getLogger(f"CLI.{conference}")
     
     try:
@@ -69,7 +71,7 @@ def run_crawler(conference: str, years: Tuple[int, int], crawler_type: str):
         else:
             raise ValueError(f"Unknown crawler type: {crawler_type}")
         
-        result = crawler.crawl()
+        result = asyncio.run(crawler.acrawl()) if use_async else crawler.crawl()
         
         if result.success:
             logger.info(f"Successfully completed {crawler_type} crawl for {conference}")
@@ -126,6 +128,13 @@ def main():
         help='Enable verbose logging'
     )
     
+    parser.add_argument(
+        '--async',
+        dest='use_async',
+        action='store_true',
+        help='Run the crawler on asyncio; the citations crawler uses the async API clients (requires aiohttp)'
+    )
+    
     parser.add_argument(
         '--dry-run',
         action='store_true',
@@ -163,9 +172,15 @@ def main():
     successful_crawls = 0
     failed_crawls = 0
     
+    try:
+        preload_dblp_source(conferences, [crawler_type])
+    except (OSError, ValueError) as e:
+        logger.error(f"Could not read the DBLP dump: {e}")
+        sys.exit(1)
+
     for conference in conferences:
         try:
-            run_crawler(conference, years, crawler_type)
+            run_crawler(conference, years, crawler_type, args.use_async)
             successful_crawls += 1
         except SystemExit:
             failed_crawls += 1
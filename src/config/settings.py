@@ -1,5 +1,5 @@
 import os
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from dotenv import load_dotenv
 
@@ -19,21 +19,60 @@ class APIConfig:
 class RequestConfig:
     """HTTP and retry settings."""
     timeout: int = 10
+    connect_timeout: float = 5.0
+    read_timeout: float = 10.0
+    pool_size: Optional[int] = None  # defaults to max_workers
     max_retries: int = 3
     retry_backoff_factor: int = 2
+    # Sustained rate per API as seconds per request; burst is how many
+    # requests may go out back-to-back after an idle period.
     semantic_scholar_rate_limit: float = 1.0
-    openalex_rate_limit: float = 0.3
+    openalex_rate_limit: float = 0.1
+    crossref_rate_limit: float = 0.1
+    dblp_rate_limit: float = 1.0
+    semantic_scholar_burst: int = 1
+    openalex_burst: int = 10
+    crossref_burst: int = 5
+    dblp_burst: int = 2
+    # DBLP pages downloaded at once; dblp.org asks crawlers to stay gentle
+    dblp_max_connections: int = 2
 
 
 @dataclass
 class CrawlerConfig:
     """Crawler settings."""
     max_workers: int = 5
+    # Citing papers waiting for OpenAlex enrichment between pipeline stages
+    pipeline_queue_size: int = 64
+    # Papers whose inline S2 citation list is truncated are paged through
+    # /paper/{id}/citations, up to this many citations, several pages at a time
+    max_citations_per_paper: int = 10000
+    citation_page_workers: int = 4
     use_caching: bool = True
+    output_format: str = 'json'  # 'json' (one nested file per stage) or 'jsonl' (per-year shards + manifest)
+    cache_backend: str = 'sqlite'  # 'sqlite' or 'json' (one file per response)
+    memory_cache_max_entries: int = 10000
+    memory_cache_max_bytes: int = 256 * 1024 * 1024
+    # Seconds a cached response stays fresh per API (None = never expires);
+    # 404s are remembered for negative_cache_ttl seconds.
+    cache_ttl: Dict[str, Optional[float]] = None
+    negative_cache_ttl: float = 24 * 3600
     enable_progress_bar: bool = True
+    dblp_source: str = 'html'  # 'html' (proceedings pages), 'xml' (their TOC export) or 'dump' (dblp.xml.gz)
+    # Sections of the proceedings left out; the 'dump' source has no sections and needs this to be []
     skip_sections: List[str] = None
+    # OpenAlex source IDs of each conference (look them up at https://api.openalex.org/sources?search=...).
+    # Listed conferences have their works harvested per venue instead of looked up one DOI at a time.
+    openalex_venue_sources: Dict[str, List[str]] = None
     
     def __post_init__(self):
+        if self.cache_ttl is None:
+            self.cache_ttl = {
+                "openalex": 30 * 24 * 3600,
+                "semantic_scholar": 14 * 24 * 3600,
+                "crossref": 30 * 24 * 3600,
+                "dblp": 24 * 3600,
+            }
         if self.skip_sections is None:
             self.skip_sections = [
                 "workshop", "tutorial", "keynote", "panel", "poster",
@@ -41,6 +80,20 @@ class CrawlerConfig:
                 "short paper", "tutorials", "demonstration", "PhD Symposium", 
                 "short research"
             ]
+        if self.openalex_venue_sources is None:
+            self.openalex_venue_sources = {}
+
+
+@dataclass
+class ConcurrencyConfig:
+    """Adaptive (AIMD) in-flight request limits per API."""
+    enabled: bool = True
+    min_limit: int = 1
+    max_limit: int = 32
+    latency_target: float = 2.0
+    decrease_factor: float = 0.5
+    # Coroutines enriching papers at once in the async crawlers
+    async_tasks: int = 128
 
 
 @dataclass
@@ -51,6 +104,13 @@ class PathConfig:
     extended_crawler_output_dir: str = './data/extended_crawler_data'
     citations_crawler_output_dir: str = './data/citations_crawler_data'
     cache_dir: str = './cache'
+    cache_db_path: str = './cache/responses.sqlite3'
+    author_institutions_db_path: str = './cache/author_institutions.sqlite3'
+    # Full DBLP dump (https://dblp.org/xml/), with dblp.dtd in the same directory
+    dblp_dump_path: str = './data/dblp/dblp.xml.gz'
+    # Built with `python -m utils.openalex_snapshot build`; used only if it exists
+    openalex_snapshot_db_path: str = './cache/openalex_snapshot.sqlite3'
+    citation_checkpoint_dir: str = './cache/citation_checkpoints'
     logs_dir: str = './logs'
 
 
@@ -65,6 +125,7 @@ class LoggingConfig:
 api_config = APIConfig()
 request_config = RequestConfig()
 crawler_config = CrawlerConfig()
+concurrency_config = ConcurrencyConfig()
 path_config = PathConfig()
 logging_config = LoggingConfig()
 
@@ -74,20 +135,53 @@ SEMANTIC_SCHOLAR_API_URL = api_config.semantic_scholar_url
 OPENALEX_API_URL = api_config.openalex_url
 
 REQUEST_TIMEOUT = request_config.timeout
+REQUEST_TIMEOUTS = (request_config.connect_timeout, request_config.read_timeout)
 MAX_RETRIES = request_config.max_retries
 RETRY_BACKOFF_FACTOR = request_config.retry_backoff_factor
 SEMANTIC_SCHOLAR_RATE_LIMIT = request_config.semantic_scholar_rate_limit
 OPENALEX_RATE_LIMIT = request_config.openalex_rate_limit
+CROSSREF_RATE_LIMIT = request_config.crossref_rate_limit
+API_RATE_LIMITS = {
+    'semantic_scholar': (request_config.semantic_scholar_rate_limit, request_config.semantic_scholar_burst),
+    'openalex': (request_config.openalex_rate_limit, request_config.openalex_burst),
+    'crossref': (request_config.crossref_rate_limit, request_config.crossref_burst),
+    'dblp': (request_config.dblp_rate_limit, request_config.dblp_burst),
+}
+DBLP_MAX_CONNECTIONS = request_config.dblp_max_connections
 
 MAX_WORKERS = crawler_config.max_workers
+PIPELINE_QUEUE_SIZE = crawler_config.pipeline_queue_size
+MAX_CITATIONS_PER_PAPER = crawler_config.max_citations_per_paper
+CITATION_PAGE_WORKERS = crawler_config.citation_page_workers
 USE_CACHING = crawler_config.use_caching
+OUTPUT_FORMAT = crawler_config.output_format
+CACHE_BACKEND = crawler_config.cache_backend
+MEMORY_CACHE_MAX_ENTRIES = crawler_config.memory_cache_max_entries
+MEMORY_CACHE_MAX_BYTES = crawler_config.memory_cache_max_bytes
+CACHE_TTL = crawler_config.cache_ttl
+NEGATIVE_CACHE_TTL = crawler_config.negative_cache_ttl
 ENABLE_PROGRESS_BAR = crawler_config.enable_progress_bar
 SKIP_SECTIONS = crawler_config.skip_sections
+DBLP_SOURCE = crawler_config.dblp_source
+OPENALEX_VENUE_SOURCES = crawler_config.openalex_venue_sources
+
+ADAPTIVE_CONCURRENCY = concurrency_config.enabled
+# With adaptive concurrency the pools are sized for the ceiling and the
+# controller decides how many of those threads may have a request in flight.
+WORKER_POOL_SIZE = concurrency_config.max_limit if ADAPTIVE_CONCURRENCY else MAX_WORKERS
+HTTP_POOL_SIZE = request_config.pool_size or WORKER_POOL_SIZE
+ASYNC_TASKS = concurrency_config.async_tasks
 
 DEFAULT_OUTPUT_DIR = path_config.default_output_dir
 BASE_CRAWLER_OUTPUT_DIR = path_config.base_crawler_output_dir
 EXTENDED_CRAWLER_OUTPUT_DIR = path_config.extended_crawler_output_dir
 CITATIONS_CRAWLER_OUTPUT_DIR = path_config.citations_crawler_output_dir
+CACHE_DIR = path_config.cache_dir
+CACHE_DB_PATH = path_config.cache_db_path
+AUTHOR_INSTITUTIONS_DB_PATH = path_config.author_institutions_db_path
+DBLP_DUMP_PATH = path_config.dblp_dump_path
+OPENALEX_SNAPSHOT_DB_PATH = path_config.openalex_snapshot_db_path
+CITATION_CHECKPOINT_DIR = path_config.citation_checkpoint_dir
 
 LOG_FILE = logging_config.log_file
 LOG_LEVEL = logging_config.log_level
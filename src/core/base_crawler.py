@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Tuple
 import logging
@@ -62,6 +63,33 @@ class AbstractCrawler(ABC):
             self.logger.error(error_msg, exc_info=True)
             return CrawlerResult(success=False, error=error_msg)
     
+    async def acrawl(self) -> CrawlerResult:
+        """Run the load, process and save pipeline on the running event loop.
+        
+        Loading and saving are file work and run in a worker thread; the
+        processing step is ``aprocess_data``.
+        """
+        try:
+            self.logger.info(f"Starting async crawl for {self.conference} ({self.first_year}-{self.last_year})")
+            await asyncio.to_thread(self.load_data)
+            result = await self.aprocess_data()
+            await asyncio.to_thread(self.save_data)
+            self.logger.info(f"Successfully completed crawl for {self.conference}")
+            return CrawlerResult(success=True, data=result)
+            
+        except Exception as e:
+            error_msg = f"Error during crawl for {self.conference}: {str(e)}"
+            self.logger.error(error_msg, exc_info=True)
+            return CrawlerResult(success=False, error=error_msg)
+    
+    async def aprocess_data(self) -> Dict[str, Any]:
+        """Async processing step; crawlers with async clients override it.
+        
+        By default the threaded ``process_data`` runs in a worker thread, so
+        every crawler can be driven by ``acrawl``.
+        """
+        return await asyncio.to_thread(self.process_data)
+    
     @abstractmethod
     def load_data(self) -> None:
         """Load input data."""
@@ -10,6 +10,7 @@ sys.path.insert(0, str(project_root))
 from crawler.base_crawler import BaseCrawler
 from crawler.citations_crawler import CitationsCrawler
 from crawler.extended_crawler import ExtendedCrawler
+from crawler.dblp_source import preload_dblp_source
 from src.config.settings import crawler_config, logging_config
 
 
@@ -24,10 +25,13 @@ def setup_logging() -> None:
     )
 
 
+DEFAULT_CRAWLER_TYPES = ['base', 'extended', 'citations']
+
+
 def crawl_conference(conference: str, years: Tuple[int, int], 
                     crawler_types: List[str] = None) -> None:
     if crawler_types is None:
-        crawler_types = ['base', 'extended', 'citations']
+        crawler_types = DEFAULT_CRAWLER_TYPES
     
     logger = logging.getLogger(f"Main.{conference}")
     logger.info(f"Starting crawl for {conference} ({years[0]}-{years[1]})")
@@ -71,6 +75,13 @@ def main():
     logger.info(f"Starting crawl for {len(conferences)} conferences")
     logger.info(f"Years: {years[0]}-{years[1]}")
     
+    # With the DBLP dump, every conference is read in one pass before crawling
+    try:
+        preload_dblp_source(conferences, DEFAULT_CRAWLER_TYPES)
+    except (OSError, ValueError) as e:
+        logger.error(f"Could not read the DBLP dump: {e}")
+        sys.exit(1)
+    
     successful_crawls = 0
     failed_crawls = 0
     
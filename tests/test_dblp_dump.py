@@ -0,0 +1,117 @@
+import gzip
+import shutil
+from pathlib import Path
+
+import pytest
+
+import crawler.dblp_source as dblp_source
+from crawler.dblp_dump import read_dump_records
+from crawler.dblp_source import DumpDblpSource
+
+FIXTURES = Path(__file__).parent / "fixtures"
+SAMPLE_DUMP = FIXTURES / "dblp_sample.xml"
+DBLP_CONF = "https://dblp.org/db/conf/"
+
+
+@pytest.fixture
+def gzipped_dump(tmp_path):
+    """The sample dump compressed like dblp.xml.gz, with its DTD next to it."""
+    shutil.copy(FIXTURES / "dblp.dtd", tmp_path / "dblp.dtd")
+    dump_path = tmp_path / "dblp.xml.gz"
+    with open(SAMPLE_DUMP, "rb") as source, gzip.open(dump_path, "wb") as target:
+        shutil.copyfileobj(source, target)
+    return dump_path
+
+
+def test_reads_only_accepted_papers():
+    records = list(read_dump_records(SAMPLE_DUMP, lambda link: "/middleware/" in link))
+
+    assert [link for link, _ in records] == [DBLP_CONF + "middleware/middleware2023.html",
+                                             DBLP_CONF + "middleware/middleware2022.html",
+                                             DBLP_CONF + "middleware/middleware2023w1.html"]
+
+
+def test_records_match_the_page_parsers(gzipped_dump):
+    link, record = next(read_dump_records(gzipped_dump, lambda link: "/middleware/" in link))
+
+    assert link == DBLP_CONF + "middleware/middleware2023.html"
+    assert record.title == "Fast Serverless Snapshots."
+    assert record.year == "2023"
+    assert record.authors == ["Anna Müller", "José García"]
+    assert record.doi == "10.1145/3590140.3629100"
+    assert record.openalex_link.endswith("10.1145/3590140.3629100")
+
+
+def test_source_serves_year_links_and_records():
+    source = DumpDblpSource(skip_sections=(), dump_path=SAMPLE_DUMP)
+
+    links = source.get_year_links("middleware", 2022, 2023)
+
+    # Workshop volumes are left out
+    assert links == [DBLP_CONF + "middleware/middleware2022.html", DBLP_CONF + "middleware/middleware2023.html"]
+    assert [record.title for record in source.get_records(links[0])] == ["A Paper Without DOI."]
+    assert source.get_records(links[0])[0].doi is None
+
+
+@pytest.mark.parametrize("conference, link", [
+    ("cloud", DBLP_CONF + "cloud/socc2023.html"),
+    ("atc", DBLP_CONF + "usenix/usenix2023.html"),
+])
+def test_source_maps_dblp_names(conference, link):
+    source = DumpDblpSource(skip_sections=(), dump_path=SAMPLE_DUMP)
+
+    assert source.get_year_links(conference, 2023, 2023) == [link]
+
+
+def test_conferences_are_read_in_one_pass(monkeypatch):
+    passes = []
+
+    def counting_reader(dump_path, accept_link):
+        passes.append(dump_path)
+        return read_dump_records(dump_path, accept_link)
+
+    monkeypatch.setattr(dblp_source, "read_dump_records", counting_reader)
+    source = DumpDblpSource(skip_sections=(), dump_path=SAMPLE_DUMP)
+
+    source.ingest(["middleware", "cloud", "atc"])
+    for conference in ("middleware", "cloud", "atc"):
+        assert source.get_year_links(conference, 2023, 2023)
+
+    assert passes == [SAMPLE_DUMP]
+
+
+def test_shared_directory_is_not_read_twice():
+    source = DumpDblpSource(skip_sections=(), dump_path=SAMPLE_DUMP)
+
+    source.ingest(["atc"])
+    source.ingest(["usenix"])
+
+    assert len(source.get_records(DBLP_CONF + "usenix/usenix2023.html")) == 1
+
+
+def test_dump_source_is_shared(monkeypatch):
+    monkeypatch.setattr(dblp_source, "_dump_sources", {})
+
+    assert dblp_source.get_dblp_source(None, "dump", ()) is dblp_source.get_dblp_source(None, "dump", ())
+    assert dblp_source.get_dblp_source(None, "html") is not dblp_source.get_dblp_source(None, "html")
+
+
+def test_dump_source_refuses_skip_sections():
+    with pytest.raises(ValueError, match="skip_sections"):
+        DumpDblpSource(skip_sections=("keynote",), dump_path=SAMPLE_DUMP)
+
+
+def test_preload_reads_the_dump_only_for_base_crawls(monkeypatch):
+    ingested = []
+
+    class RecordingSource:
+        def ingest(self, conferences):
+            ingested.append(list(conferences))
+
+    monkeypatch.setattr(dblp_source, "get_dblp_source", lambda dblp_client, name: RecordingSource())
+
+    dblp_source.preload_dblp_source(["nsdi", "osdi"], ["extended"], name="dump")
+    dblp_source.preload_dblp_source(["nsdi", "osdi"], ["base", "extended"], name="html")
+    dblp_source.preload_dblp_source(["nsdi", "osdi"], ["base", "extended"], name="dump")
+
+    assert ingested == [["nsdi", "osdi"]]
@@ -0,0 +1,111 @@
+from pathlib import Path
+
+import pytest
+
+import api_clients.base_api_client as base_api_client
+import api_clients.openalex_client as openalex_client
+from api_clients.openalex_client import OpenAlexClient
+from utils.openalex_snapshot import OpenAlexSnapshotIndex, build_index, normalize_doi, snapshot_files
+
+SNAPSHOT = Path(__file__).parent / "fixtures" / "openalex_snapshot" / "works"
+UPDATED_DOI = "10.1145/1111.2222"
+OLD_DOI = "10.1145/3333.4444"
+
+
+@pytest.fixture
+def index(tmp_path):
+    db_path = str(tmp_path / "snapshot.sqlite3")
+    build_index([str(SNAPSHOT)], db_path)
+    return OpenAlexSnapshotIndex(db_path)
+
+
+@pytest.fixture
+def make_client(index, monkeypatch):
+    """OpenAlex clients reading the fixture index, with no cache, author map or network."""
+    monkeypatch.setattr(base_api_client, "USE_CACHING", False)
+    monkeypatch.setattr(openalex_client, "get_author_institution_store", lambda: None)
+    monkeypatch.setattr(openalex_client, "get_openalex_snapshot_index", lambda: index)
+
+    def make(stage, response=None):
+        client = OpenAlexClient(stage)
+        client.requests = []
+
+        def make_request(url, params=None, **kwargs):
+            client.requests.append((url, params))
+            return response
+        client.make_request = make_request
+        return client
+    return make
+
+
+def test_partitions_are_read_oldest_first():
+    assert [Path(path).parent.name for path in snapshot_files([str(SNAPSHOT)])] == \
+        ["updated_date=2024-01-01", "updated_date=2024-06-01"]
+
+
+def test_build_index_keeps_the_newer_version(tmp_path):
+    db_path = str(tmp_path / "snapshot.sqlite3")
+
+    # Works without a DOI are not indexed
+    assert build_index([str(SNAPSHOT)], db_path) == 3
+
+    index = OpenAlexSnapshotIndex(db_path)
+    work = index.get(UPDATED_DOI)
+    assert work["title"] == "New Title"
+    assert work["authorships"][0]["institutions"] == [{"display_name": "Uni B", "country_code": "ES"}]
+    assert index.get(OLD_DOI)["title"] == "Second Paper"
+    assert index.get("10.1145/0000.0000") is None
+
+
+@pytest.mark.parametrize("doi", [
+    "10.1145/1111.2222",
+    "10.1145/1111.2222 ",
+    "https://doi.org/10.1145/1111.2222",
+    "HTTPS://DOI.ORG/10.1145/1111.2222",
+    "http://dx.doi.org/10.1145/1111.2222",
+])
+def test_normalize_doi(doi):
+    assert normalize_doi(doi) == UPDATED_DOI
+
+
+def test_normalize_doi_lowercases():
+    assert normalize_doi("10.1145/ABC.Def") == "10.1145/abc.def"
+    assert normalize_doi(None) is None
+
+
+def test_lookups_keep_the_requested_spelling(index):
+    spelling = "https://doi.org/10.1145/1111.2222".upper()
+
+    assert index.get_many([spelling, OLD_DOI]).keys() == {spelling, OLD_DOI}
+
+
+def test_request_by_doi_is_answered_from_the_index(make_client):
+    client = make_client("base")
+
+    work = client.request_by_doi("https://doi.org/10.1145/1111.2222")
+
+    assert work["title"] == "New Title"
+    assert client.requests == []
+
+
+def test_request_by_dois_only_requests_unindexed_dois(make_client):
+    client = make_client("citations", response={"results": []})
+
+    works = client.request_by_dois([UPDATED_DOI, OLD_DOI.upper(), "10.1145/0000.0000"])
+
+    assert works[UPDATED_DOI]["id"] == "https://openalex.org/W1"
+    assert works[OLD_DOI.upper()]["id"] == "https://openalex.org/W2"
+    # Works are trimmed to the client's profile
+    assert "title" not in works[UPDATED_DOI]
+    assert works["10.1145/0000.0000"] is None
+    assert len(client.requests) == 1
+    assert client.requests[0][1]["filter"] == "doi:10.1145/0000.0000"
+
+
+def test_full_profile_goes_to_the_api(make_client):
+    client = make_client(None, response={"id": "https://openalex.org/W1", "doi": UPDATED_DOI})
+
+    work = client.request_by_doi(UPDATED_DOI)
+
+    assert work == {"id": "https://openalex.org/W1", "doi": UPDATED_DOI}
+    assert [url for url, _ in client.requests] == [f"{openalex_client.OPENALEX_API_URL}/doi:{UPDATED_DOI}"]
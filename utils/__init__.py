@@ -2,7 +2,11 @@ from .file_utils import FileUtils
 from .paper_data_builder import PaperDataBuilder
 from .rate_limiter import get_rate_limiter
 from .request_cache import get_request_cache
+from .http_session import get_session_pool
+from .concurrency_controller import get_concurrency_controller
+from .single_flight import get_single_flight
 
-__all__ = ['FileUtils', 'PaperDataBuilder', 'get_rate_limiter', 'get_request_cache']
+__all__ = ['FileUtils', 'PaperDataBuilder', 'get_rate_limiter', 'get_request_cache', 'get_session_pool',
+           'get_concurrency_controller', 'get_single_flight']
 
 
@@ -0,0 +1,89 @@
+import json
+import os
+import sqlite3
+import threading
+from config import AUTHOR_INSTITUTIONS_DB_PATH, MEMORY_CACHE_MAX_ENTRIES
+from utils.memory_cache import BoundedMemoryCache
+
+
+class AuthorInstitutionStore:
+    """Persistent map from OpenAlex author ID to last known institution.
+
+    Authors whose profile has no institution are stored as None so they are
+    not looked up again either. Entries are kept across runs and conferences;
+    the most recently used ones are also kept in a bounded in-memory LRU.
+    """
+
+    def __init__(self, db_path=AUTHOR_INSTITUTIONS_DB_PATH, max_memory_entries=MEMORY_CACHE_MAX_ENTRIES):
+        self.db_path = db_path
+        # Values are wrapped in a tuple so a stored None is told apart from a miss
+        self._memory = BoundedMemoryCache(max_entries=max_memory_entries)
+        self._local = threading.local()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS author_institutions (author_id TEXT PRIMARY KEY, institution TEXT)"
+        )
+        conn.commit()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30.0)
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, author_ids):
+        """Return {author_id: institution or None} for the IDs already known."""
+        found = {}
+        missing = []
+        for author_id in author_ids:
+            entry = self._memory.get(author_id)
+            if entry is not None:
+                found[author_id] = entry[0]
+            else:
+                missing.append(author_id)
+        conn = self._connection()
+        for i in range(0, len(missing), 500):
+            chunk = missing[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT author_id, institution FROM author_institutions WHERE author_id IN ({placeholders})", chunk
+            ).fetchall()
+            for author_id, institution in rows:
+                found[author_id] = json.loads(institution) if institution else None
+        self._remember({author_id: found[author_id] for author_id in missing if author_id in found})
+        return found
+
+    def set_many(self, institutions):
+        """Store {author_id: institution or None}."""
+        if not institutions:
+            return
+        self._remember(institutions)
+        rows = [(author_id, json.dumps(institution) if institution else None)
+                for author_id, institution in institutions.items()]
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO author_institutions (author_id, institution) VALUES (?, ?)", rows
+            )
+
+    def _remember(self, institutions):
+        for author_id, institution in institutions.items():
+            self._memory.set(author_id, (institution,), 1)
+
+
+_author_institution_store = None
+_author_institution_store_lock = threading.Lock()
+
+
+def get_author_institution_store():
+    # Created on first use so importing a client does not create the database
+    global _author_institution_store
+    with _author_institution_store_lock:
+        if _author_institution_store is None:
+            _author_institution_store = AuthorInstitutionStore()
+    return _author_institution_store
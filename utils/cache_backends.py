@@ -0,0 +1,280 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+
+@dataclass
+class CacheEntry:
+    """A cached response plus what is needed to expire and revalidate it."""
+    data: Any
+    stored_at: float = field(default_factory=time.time)
+    status: int = 200
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def is_negative(self):
+        """True for remembered failures (e.g. 404) that carry no data."""
+        return self.status != 200
+
+    def age(self):
+        return time.time() - self.stored_at
+
+
+class CacheBackend(ABC):
+    """Persistent storage for cached API responses.
+
+    Keys are the md5 request keys built by ``RequestCache``; values are
+    ``CacheEntry`` objects whose data is JSON-serialisable.
+    """
+
+    @abstractmethod
+    def get(self, key):
+        """Return the stored CacheEntry or None."""
+
+    @abstractmethod
+    def set(self, key, entry):
+        """Store a CacheEntry under key."""
+
+    def get_many(self, keys):
+        """Return a dict with the entries found for ``keys``."""
+        found = {}
+        for key in keys:
+            entry = self.get(key)
+            if entry is not None:
+                found[key] = entry
+        return found
+
+    def set_many(self, items):
+        """Store every (key, entry) pair of the ``items`` dict."""
+        for key, entry in items.items():
+            self.set(key, entry)
+
+    def touch(self, key):
+        """Mark an entry as freshly validated."""
+        entry = self.get(key)
+        if entry is not None:
+            entry.stored_at = time.time()
+            self.set(key, entry)
+
+    def close(self):
+        pass
+
+
+class JsonFileCacheBackend(CacheBackend):
+    """Legacy layout: one ``<md5>.json`` file per response in ``cache_dir``.
+
+    Metadata that cannot be derived from the file itself (validators, negative
+    status) goes to an optional ``<md5>.meta.json`` sidecar; otherwise the
+    file's mtime is the storage time.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _get_cache_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _get_meta_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.meta.json")
+
+    def _read_json(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, key):
+        meta = self._read_json(self._get_meta_path(key))
+        cache_path = self._get_cache_path(key)
+        if meta is None:
+            try:
+                stored_at = os.path.getmtime(cache_path)
+            except OSError:
+                return None
+            data = self._read_json(cache_path)
+            return CacheEntry(data, stored_at) if data is not None else None
+        status = meta.get("status", 200)
+        data = self._read_json(cache_path) if status == 200 else None
+        if status == 200 and data is None:
+            return None
+        return CacheEntry(data, meta.get("stored_at", time.time()), status,
+                          meta.get("etag"), meta.get("last_modified"))
+
+    def set(self, key, entry):
+        try:
+            if not entry.is_negative:
+                with open(self._get_cache_path(key), 'w', encoding='utf-8') as f:
+                    json.dump(entry.data, f)
+            meta_path = self._get_meta_path(key)
+            if entry.is_negative or entry.etag or entry.last_modified:
+                with open(meta_path, 'w', encoding='utf-8') as f:
+                    json.dump({"stored_at": entry.stored_at, "status": entry.status,
+                               "etag": entry.etag, "last_modified": entry.last_modified}, f)
+            elif os.path.exists(meta_path):
+                os.remove(meta_path)
+        except OSError as e:
+            logging.debug(f"Could not write cache file for {key}: {e}")
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Single-file SQLite cache in WAL mode with zlib-compressed JSON blobs.
+
+    WAL lets several crawler processes read while one writes. Each thread gets
+    its own connection because sqlite3 connections are not shareable across
+    threads.
+    """
+
+    _COLUMNS = {
+        "status": "INTEGER NOT NULL DEFAULT 200",
+        "etag": "TEXT",
+        "last_modified": "TEXT",
+    }
+
+    def __init__(self, db_path, compression_level=6, busy_timeout=30.0):
+        self.db_path = db_path
+        self.compression_level = compression_level
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, created_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT)")
+        # Databases created before validators were stored lack these columns.
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(responses)")}
+        for column, definition in self._COLUMNS.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE responses ADD COLUMN {column} {definition}")
+        conn.commit()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _encode(self, value):
+        return zlib.compress(json.dumps(value).encode('utf-8'), self.compression_level)
+
+    def _decode(self, blob):
+        return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+    def _row_to_entry(self, row):
+        blob, created_at, status, etag, last_modified = row
+        return CacheEntry(self._decode(blob), created_at, status, etag, last_modified)
+
+    def get(self, key):
+        row = self._connection().execute(
+            "SELECT value, created_at, status, etag, last_modified FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        return self._row_to_entry(row) if row else None
+
+    def set(self, key, entry):
+        self.set_many({key: entry})
+
+    def get_many(self, keys):
+        keys = list(keys)
+        found = {}
+        conn = self._connection()
+        # Stay well below SQLITE_MAX_VARIABLE_NUMBER on older builds.
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                "SELECT key, value, created_at, status, etag, last_modified "
+                f"FROM responses WHERE key IN ({placeholders})", chunk
+            ).fetchall()
+            for row in rows:
+                found[row[0]] = self._row_to_entry(row[1:])
+        return found
+
+    def set_many(self, items):
+        if not items:
+            return
+        rows = [(key, self._encode(entry.data), entry.stored_at, entry.status, entry.etag, entry.last_modified)
+                for key, entry in items.items()]
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, status, etag, last_modified) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def touch(self, key):
+        conn = self._connection()
+        with conn:
+            conn.execute("UPDATE responses SET created_at = ? WHERE key = ?", (time.time(), key))
+
+    def get_metadata(self, name):
+        """Return a value stored with ``set_metadata``, or None."""
+        row = self._connection().execute("SELECT value FROM metadata WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_metadata(self, name, value):
+        conn = self._connection()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO metadata (name, value) VALUES (?, ?)", (name, value))
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def migrate_json_cache(cache_dir, backend, batch_size=1000):
+    """Copy every ``<md5>.json`` file in ``cache_dir`` into ``backend``.
+
+    File names already are the request keys, so entries keep their identity
+    and their age. Keys ``backend`` already holds are left alone, so an
+    interrupted migration can be run again without overwriting newer
+    entries. Unreadable files are skipped. Returns the number of migrated
+    entries.
+    """
+    if not os.path.isdir(cache_dir):
+        return 0
+    migrated = 0
+    pending = {}
+    seen = set()
+    legacy = JsonFileCacheBackend(cache_dir)
+    for dir_entry in os.scandir(cache_dir):
+        name = dir_entry.name
+        if not dir_entry.is_file() or not name.endswith('.json'):
+            continue
+        key = name[:-len('.meta.json')] if name.endswith('.meta.json') else name[:-len('.json')]
+        if key in seen:
+            continue
+        seen.add(key)
+        entry = legacy.get(key)
+        if entry is None:
+            continue
+        pending[key] = entry
+        if len(pending) >= batch_size:
+            migrated += _copy_missing(backend, pending)
+            pending = {}
+    migrated += _copy_missing(backend, pending)
+    return migrated
+
+
+def _copy_missing(backend, entries):
+    stored = backend.get_many(entries)
+    missing = {key: entry for key, entry in entries.items() if key not in stored}
+    backend.set_many(missing)
+    return len(missing)
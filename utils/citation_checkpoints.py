@@ -0,0 +1,69 @@
+import json
+import logging
+import os
+import threading
+from config import CITATION_CHECKPOINT_DIR
+
+
+class CitationCheckpoints:
+    """Citation pages already fetched for a paper, kept across runs.
+
+    Each paper has a JSON Lines file with one ``{"offset": ..., "data": [...]}``
+    line per page, appended as pages arrive, so an interrupted fetch resumes
+    with the pages it is missing.
+    """
+
+    def __init__(self, directory=CITATION_CHECKPOINT_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, paper_id):
+        return os.path.join(self.directory, f"{paper_id}.jsonl")
+
+    def iter_pages(self, paper_id):
+        """Yield (offset, citing papers) for the pages stored for ``paper_id``, by offset.
+
+        Pages are read back one at a time, so a paper's citations never all
+        sit in memory.
+        """
+        path = self._path(paper_id)
+        if not os.path.exists(path):
+            return
+        positions = {}
+        with open(path, "rb") as f:
+            position = f.tell()
+            for line in iter(f.readline, b""):
+                try:
+                    positions[json.loads(line)["offset"]] = position
+                except json.JSONDecodeError:
+                    # A line cut short by a crash; that page is fetched again
+                    logging.debug(f"Ignoring a truncated citation page in {path}")
+                position = f.tell()
+            for offset in sorted(positions):
+                f.seek(positions[offset])
+                yield offset, json.loads(f.readline())["data"]
+
+    def append(self, paper_id, offset, data):
+        line = json.dumps({"offset": offset, "data": data}, ensure_ascii=False)
+        with self._lock:
+            with open(self._path(paper_id), "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def clear(self, paper_id):
+        """Forget a paper's pages, once its citations have been saved."""
+        try:
+            os.remove(self._path(paper_id))
+        except FileNotFoundError:
+            pass
+
+
+_citation_checkpoints = None
+
+
+def get_citation_checkpoints():
+    # Created on first use so crawls that never page citations leave no directory behind
+    global _citation_checkpoints
+    if _citation_checkpoints is None:
+        _citation_checkpoints = CitationCheckpoints()
+    return _citation_checkpoints
@@ -0,0 +1,146 @@
+import time
+import asyncio
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from config import concurrency_config, ADAPTIVE_CONCURRENCY, MAX_WORKERS, WORKER_POOL_SIZE
+
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on the number of in-flight requests to one API.
+
+    The limit grows by roughly one slot per "round" of healthy responses and is
+    multiplied by ``decrease_factor`` on 429/5xx or transport errors. A
+    ``pause`` (from Retry-After) blocks every caller of the API until it expires.
+    """
+
+    def __init__(self, api_name, initial_limit, min_limit, max_limit, latency_target, decrease_factor):
+        self.api_name = api_name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._in_flight = 0
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self):
+        return int(self._limit)
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def acquire(self):
+        with self._cond:
+            while True:
+                pause = self._blocked_until - time.monotonic()
+                if pause > 0:
+                    self._cond.wait(pause)
+                elif self._in_flight < self.limit:
+                    self._in_flight += 1
+                    return
+                else:
+                    self._cond.wait()
+
+    def try_acquire(self):
+        """Take a slot only if one is free and the API is not paused."""
+        with self._cond:
+            if self._blocked_until > time.monotonic() or self._in_flight >= self.limit:
+                return False
+            self._in_flight += 1
+            return True
+
+    async def acquire_async(self, poll_interval=0.05):
+        """``acquire`` for coroutines: waits on the event loop instead of blocking its thread."""
+        while not self.try_acquire():
+            await asyncio.sleep(max(poll_interval, self._blocked_until - time.monotonic()))
+
+    def release(self, latency=None, status=None):
+        """Return a slot and feed the outcome of the request into the limit.
+
+        Args:
+            latency: Seconds the request took
+            status: HTTP status code, or None if the request failed outright
+        """
+        with self._cond:
+            self._in_flight -= 1
+            previous = self.limit
+            if status is None or status == 429 or status >= 500:
+                self._decrease()
+            elif latency is not None and latency <= self.latency_target:
+                self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+            if self.limit != previous:
+                logging.debug(f"Concurrency limit for {self.api_name}: {previous} -> {self.limit}")
+            self._cond.notify_all()
+
+    def pause(self, seconds):
+        """Hold back every caller of this API for ``seconds`` (e.g. Retry-After)."""
+        with self._cond:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def _decrease(self):
+        now = time.monotonic()
+        # Responses already in flight when the first 429 arrived would otherwise
+        # cut the limit once each; one cut per latency window is enough.
+        if now - self._last_decrease >= self.latency_target:
+            self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+            self._last_decrease = now
+
+
+class ConcurrencyController:
+    """Registry of per-API adaptive limiters shared by all clients."""
+
+    def __init__(self, enabled=ADAPTIVE_CONCURRENCY, initial_limit=MAX_WORKERS):
+        self.enabled = enabled
+        self.initial_limit = initial_limit
+        self.max_workers = WORKER_POOL_SIZE
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def get_limiter(self, api_name):
+        """Return the limiter for ``api_name``, or None when disabled."""
+        if not self.enabled or not api_name:
+            return None
+        with self._lock:
+            limiter = self._limiters.get(api_name)
+            if limiter is None:
+                limiter = AdaptiveConcurrencyLimiter(
+                    api_name,
+                    self.initial_limit,
+                    concurrency_config.min_limit,
+                    concurrency_config.max_limit,
+                    concurrency_config.latency_target,
+                    concurrency_config.decrease_factor,
+                )
+                self._limiters[api_name] = limiter
+            return limiter
+
+    def limits(self):
+        """Current in-flight limit per API."""
+        with self._lock:
+            return {api_name: limiter.limit for api_name, limiter in self._limiters.items()}
+
+
+_concurrency_controller = ConcurrencyController()
+
+
+def get_concurrency_controller():
+    return _concurrency_controller
@@ -0,0 +1,45 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from config import HTTP_POOL_SIZE
+
+
+class HttpSessionPool:
+    """One keep-alive ``requests.Session`` per API, shared by all worker threads."""
+
+    def __init__(self, pool_size=HTTP_POOL_SIZE):
+        self.pool_size = pool_size
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get_session(self, api_name=None):
+        """Return the pooled session for ``api_name``, creating it on first use."""
+        api_name = api_name or 'default'
+        with self._lock:
+            session = self._sessions.get(api_name)
+            if session is None:
+                session = self._create_session()
+                self._sessions[api_name] = session
+            return session
+
+    def close_all(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    def _create_session(self):
+        session = requests.Session()
+        # Every worker may hold a connection at the same time, so keep as many
+        # sockets alive per host as there are workers.
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+
+_session_pool = HttpSessionPool()
+
+
+def get_session_pool():
+    return _session_pool
@@ -0,0 +1,190 @@
+import argparse
+import glob
+import gzip
+import json
+import logging
+import os
+import sqlite3
+import threading
+import zlib
+from api_clients.field_profiles import OPENALEX_BASE
+from config import OPENALEX_SNAPSHOT_DB_PATH
+
+# Works are stored with the fields of this profile; clients whose profile it covers can use the index
+SNAPSHOT_PROFILE = OPENALEX_BASE
+
+
+def normalize_doi(doi):
+    """Lowercase DOI without resolver prefix, as OpenAlex compares them."""
+    if not doi:
+        return None
+    doi = doi.strip().lower()
+    for prefix in ("https://doi.org/", "http://doi.org/", "https://dx.doi.org/", "http://dx.doi.org/"):
+        if doi.startswith(prefix):
+            return doi[len(prefix):]
+    return doi
+
+
+def compact_work(work):
+    """Keep only what the crawlers read from a work: authorships trimmed to names and institutions."""
+    return {
+        "id": work.get("id"),
+        "doi": work.get("doi"),
+        "title": work.get("title"),
+        "authorships": [
+            {
+                "author": {"id": authorship.get("author", {}).get("id"),
+                           "display_name": authorship.get("author", {}).get("display_name")},
+                "institutions": [{"display_name": institution.get("display_name"),
+                                  "country_code": institution.get("country_code")}
+                                 for institution in authorship.get("institutions") or []],
+            }
+            for authorship in work.get("authorships") or []
+        ],
+        "referenced_works": work.get("referenced_works") or [],
+    }
+
+
+class OpenAlexSnapshotIndex:
+    """Read-only lookup of compact OpenAlex works by DOI.
+
+    Built from the ``works`` partitions of an OpenAlex snapshot with
+    ``build_index``; ``OpenAlexClient`` answers DOIs from it, when it exists,
+    before going to the cache or the network.
+    """
+
+    def __init__(self, db_path=OPENALEX_SNAPSHOT_DB_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, timeout=30.0)
+            self._local.conn = conn
+        return conn
+
+    def get(self, doi):
+        """Return the work with this DOI, or None if the snapshot does not have it."""
+        return self.get_many([doi]).get(doi)
+
+    def get_many(self, dois):
+        """Return {doi: work} for the DOIs found in the snapshot."""
+        by_key = {}
+        for doi in dois:
+            key = normalize_doi(doi)
+            if key:
+                by_key.setdefault(key, []).append(doi)
+        keys = list(by_key)
+        found = {}
+        conn = self._connection()
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(f"SELECT doi, work FROM works WHERE doi IN ({placeholders})", chunk).fetchall()
+            for key, blob in rows:
+                work = json.loads(zlib.decompress(blob))
+                for doi in by_key[key]:
+                    found[doi] = work
+        return found
+
+
+def snapshot_files(paths):
+    """The ``.gz`` partitions under ``paths`` (files or directories), oldest ``updated_date`` first."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(glob.glob(os.path.join(path, "**", "*.gz"), recursive=True))
+        else:
+            files.append(path)
+    # Partition directories are named updated_date=YYYY-MM-DD, so later files hold newer versions
+    return sorted(files)
+
+
+def build_index(paths, db_path=OPENALEX_SNAPSHOT_DB_PATH, batch_size=10000):
+    """Stream snapshot partitions (gzipped JSON Lines) into the index at ``db_path``.
+
+    Works without a DOI are skipped. A DOI seen again, in the same or a later
+    partition, replaces the earlier entry.
+
+    Args:
+        paths: Partition files or directories holding them
+        db_path: Index to create or extend
+        batch_size: Works written per transaction
+
+    Returns:
+        Number of works indexed
+    """
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    # The index is rebuilt from the snapshot if anything goes wrong, so durability is not needed
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("CREATE TABLE IF NOT EXISTS works (doi TEXT PRIMARY KEY, work BLOB) WITHOUT ROWID")
+    indexed = 0
+    rows = []
+    try:
+        for path in snapshot_files(paths):
+            logging.info(f"Indexing OpenAlex snapshot partition {path}")
+            with gzip.open(path, "rt", encoding="utf-8") as partition:
+                for line in partition:
+                    if not line.strip():
+                        continue
+                    work = json.loads(line)
+                    doi = normalize_doi(work.get("doi"))
+                    if not doi:
+                        continue
+                    blob = zlib.compress(json.dumps(compact_work(work), separators=(",", ":")).encode("utf-8"))
+                    rows.append((doi, blob))
+                    if len(rows) >= batch_size:
+                        indexed += _write_rows(conn, rows)
+                        rows = []
+        indexed += _write_rows(conn, rows)
+    finally:
+        conn.close()
+    return indexed
+
+
+def _write_rows(conn, rows):
+    with conn:
+        conn.executemany("INSERT OR REPLACE INTO works (doi, work) VALUES (?, ?)", rows)
+    return len(rows)
+
+
+_snapshot_index = OpenAlexSnapshotIndex() if os.path.exists(OPENALEX_SNAPSHOT_DB_PATH) else None
+
+
+def get_openalex_snapshot_index():
+    """The configured snapshot index, or None if it has not been built."""
+    return _snapshot_index
+
+
+def main():
+    """Command line entry point, run from the repository root::
+
+        python -m utils.openalex_snapshot build ./openalex-snapshot/data/works
+        python -m utils.openalex_snapshot lookup 10.1145/3552326.3567499
+    """
+    parser = argparse.ArgumentParser(description="Build or query the local OpenAlex snapshot index")
+    parser.add_argument('--db', default=OPENALEX_SNAPSHOT_DB_PATH, help='Index file')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='Index snapshot partitions (gzipped JSON Lines)')
+    build.add_argument('paths', nargs='+', help='Partition files or directories, e.g. data/works')
+    build.add_argument('--batch-size', type=int, default=10000, help='Works written per transaction')
+    lookup = commands.add_parser('lookup', help='Print the indexed work of a DOI')
+    lookup.add_argument('doi')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.command == 'build':
+        indexed = build_index(args.paths, args.db, args.batch_size)
+        print(f"\t> Indexed {indexed} works into {args.db} <")
+    else:
+        work = OpenAlexSnapshotIndex(args.db).get(args.doi)
+        print(json.dumps(work, indent=2) if work else f"{args.doi} is not in the index")
+
+
+if __name__ == "__main__":
+    main()
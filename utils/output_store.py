@@ -0,0 +1,338 @@
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from utils.file_utils import FileUtils
+from config import BASE_CRAWLER_OUTPUT_DIR, EXTENDED_CRAWLER_OUTPUT_DIR, CITATIONS_CRAWLER_OUTPUT_DIR, OUTPUT_FORMAT
+
+STAGE_OUTPUT_DIRS = {
+    "base": BASE_CRAWLER_OUTPUT_DIR,
+    "extended": EXTENDED_CRAWLER_OUTPUT_DIR,
+    "citations": CITATIONS_CRAWLER_OUTPUT_DIR,
+}
+MANIFEST_NAME = "manifest.json"
+# Shards of the citation pages of highly cited papers are named <year>.citation_pages.jsonl
+CITATION_PAGES = "citation_pages"
+
+
+def nested_json_path(conference, stage):
+    """The stage's single JSON file, e.g. ./data/base_crawler_data/nsdi_base_data.json."""
+    return f"{STAGE_OUTPUT_DIRS[stage]}/{conference}_{stage}_data.json"
+
+
+def shard_dir(conference, stage):
+    """Directory of the stage's per-year JSON Lines shards, next to the nested JSON file."""
+    return f"{STAGE_OUTPUT_DIRS[stage]}/{conference}_{stage}_data"
+
+
+class OutputWriter(ABC):
+    """Receives a crawler stage's records as they finish and saves them on ``commit``.
+
+    Base and extended records are papers grouped by year. Citations records
+    map a citing paper's title to its cited papers; the citing paper's year
+    is given too so they can be grouped the same way. The citations of highly
+    cited papers arrive page by page and are saved apart from their paper;
+    ``load_stage_data`` joins them back into the paper's "Citations S2".
+    """
+
+    def __init__(self, conference, stage):
+        self.conference = conference
+        self.stage = stage
+
+    @abstractmethod
+    def add_paper(self, year, record):
+        """Add one paper record of ``year``."""
+
+    @abstractmethod
+    def add_citations(self, year, title, cited_papers):
+        """Add the cited papers of the citing paper ``title``, published in ``year``."""
+
+    @abstractmethod
+    def add_citation_page(self, year, paper_id, offset, citing_papers):
+        """Add one page of the papers citing the S2 paper ``paper_id``, published in ``year``."""
+
+    @abstractmethod
+    def commit(self):
+        """Make everything added so far part of the saved output."""
+
+
+class NestedJsonWriter(OutputWriter):
+    """Original layout: one nested JSON file per stage, merged and rewritten on commit.
+
+    The whole file is built in memory, citation pages included; the JSON
+    Lines layout is the one that streams them.
+    """
+
+    def __init__(self, conference, stage):
+        super().__init__(conference, stage)
+        self.data = {}
+        self.citation_pages = {}
+        self._lock = threading.Lock()
+
+    def add_paper(self, year, record):
+        with self._lock:
+            self.data.setdefault(str(year), []).append(record)
+
+    def add_citations(self, year, title, cited_papers):
+        with self._lock:
+            self.data[title] = cited_papers
+
+    def add_citation_page(self, year, paper_id, offset, citing_papers):
+        with self._lock:
+            self.citation_pages.setdefault(paper_id, {})[offset] = citing_papers
+
+    def commit(self):
+        with self._lock:
+            if self.citation_pages:
+                _apply_citation_pages(self.data.values(), self.citation_pages)
+            FileUtils().add_data_to_existing_file(nested_json_path(self.conference, self.stage), self.data)
+
+
+class JsonlShardWriter(OutputWriter):
+    """One JSON Lines shard per year, appended to as records finish.
+
+    Citation pages go to a second shard per year,
+    ``<year>.citation_pages.jsonl``, as they arrive. Records are appended to ``<year>.jsonl.tmp`` and flushed one by one;
+    ``commit`` syncs each shard to disk and renames it over ``<year>.jsonl``,
+    so a crash leaves the previous shard intact. The records of a crashed run
+    stay in its ``.tmp`` file and the next run of that year appends to it;
+    on commit, recovered records the new run wrote again are dropped.
+    ``manifest.json`` records every committed shard with its record count and
+    commit time. As with the nested file, a year crawled again replaces what
+    was saved for it. Records without a year cannot be placed in a shard and
+    are skipped.
+    """
+
+    def __init__(self, conference, stage):
+        super().__init__(conference, stage)
+        self.directory = shard_dir(conference, stage)
+        self._files = {}
+        self._counts = {}
+        self._recovered = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def add_paper(self, year, record):
+        self._write(year, record)
+
+    def add_citations(self, year, title, cited_papers):
+        self._write(year, {"Title": title, "Cited Papers": cited_papers})
+
+    def add_citation_page(self, year, paper_id, offset, citing_papers):
+        self._write(year, {"S2 Paper ID": paper_id, "Offset": offset, "Citing Papers": citing_papers},
+                    CITATION_PAGES)
+
+    def _write(self, year, row, kind=None):
+        if year is None:
+            name = row.get('Title') or row.get('S2 Paper ID')
+            logging.warning(f"Skipping {self.stage} record '{name}' of {self.conference}: it has no year")
+            return
+        line = json.dumps(row, ensure_ascii=False) + "\n"
+        name = f"{year}.{kind}" if kind else str(year)
+        with self._lock:
+            shard = self._files.get(name)
+            if shard is None:
+                shard = self._open_shard(name)
+            shard.write(line)
+            # Flushed record by record so a crash loses at most the line being written
+            shard.flush()
+            self._counts[name] += 1
+
+    def _open_shard(self, name):
+        """Open a ``.tmp`` shard for appending, keeping the records of a crashed run."""
+        path = os.path.join(self.directory, f"{name}.jsonl.tmp")
+        recovered = 0
+        if os.path.exists(path):
+            with open(path, "r+b") as f:
+                content = f.read()
+                # A line cut short by the crash is dropped
+                complete = content[:content.rfind(b"\n") + 1]
+                f.truncate(len(complete))
+            recovered = complete.count(b"\n")
+            logging.info(f"Recovered {recovered} uncommitted {self.stage} records of {self.conference} {name}")
+        shard = open(path, "a", encoding="utf-8")
+        self._files[name] = shard
+        self._counts[name] = 0
+        self._recovered[name] = recovered
+        return shard
+
+    def commit(self):
+        with self._lock:
+            manifest = read_manifest(self.conference, self.stage)
+            pages = manifest.setdefault(CITATION_PAGES, {})
+            for name, shard in self._files.items():
+                shard.flush()
+                os.fsync(shard.fileno())
+                shard.close()
+                records = self._counts[name]
+                if self._recovered[name]:
+                    records = _merge_recovered(shard.name, self._recovered[name])
+                os.replace(shard.name, os.path.join(self.directory, f"{name}.jsonl"))
+                year, _, kind = name.partition(".")
+                section = pages if kind else manifest["shards"]
+                section[year] = {"file": f"{name}.jsonl", "records": records, "committed_at": time.time()}
+                # Pages of an earlier crawl do not belong to a year crawled again without any
+                if not kind and f"{year}.{CITATION_PAGES}" not in self._files:
+                    pages.pop(year, None)
+            self._files = {}
+            self._counts = {}
+            self._recovered = {}
+            _write_json_atomically(os.path.join(self.directory, MANIFEST_NAME), manifest)
+
+
+def _row_key(row):
+    """What identifies a shard row: the title, or the paper and offset of a citation page."""
+    if "Offset" in row:
+        return row.get("S2 Paper ID"), row["Offset"]
+    return row.get("Title")
+
+
+def _merge_recovered(path, recovered):
+    """Drop the records of a crashed run that this run wrote again.
+
+    Returns:
+        Number of records left in the shard
+    """
+    rows = _read_shard(path)
+    rewritten = {_row_key(row) for row in rows[recovered:]}
+    rows = [row for row in rows[:recovered] if _row_key(row) not in rewritten] + rows[recovered:]
+    tmp_path = path + ".merge"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(rows)
+
+
+def read_manifest(conference, stage):
+    path = os.path.join(shard_dir(conference, stage), MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {"conference": conference, "stage": stage, "shards": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json_atomically(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _read_shard(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _read_citation_pages(path):
+    """Return {S2 paper ID: {offset: citing papers}} from a citation pages shard."""
+    pages = {}
+    for row in _read_shard(path):
+        pages.setdefault(row["S2 Paper ID"], {})[row["Offset"]] = row["Citing Papers"]
+    return pages
+
+
+def _apply_citation_pages(years, pages):
+    """Set "Citations S2" of the paged papers in ``years`` (lists of records) to their pages, by offset.
+
+    The inline list is kept when the pages hold fewer citations, e.g. after failed pages.
+    """
+    for records in years:
+        if not isinstance(records, list):
+            continue
+        for record in records:
+            paper_pages = pages.get(record.get("S2 Paper ID"))
+            if not paper_pages:
+                continue
+            citations = [citing_paper for offset in sorted(paper_pages) for citing_paper in paper_pages[offset]]
+            if len(citations) > len(record.get("Citations S2") or []):
+                record["Citations S2"] = citations
+
+
+def load_stage_data(conference, stage):
+    """Load a stage's output in the nested layout, from the JSON file, the shards or both.
+
+    When both exist, each committed shard and the JSON file are applied
+    oldest first, so whichever was written last wins for its year. Paged
+    citations saved next to a year's shard are joined into its papers.
+
+    Raises:
+        FileNotFoundError: If the stage has no output for the conference
+    """
+    sources = []
+    json_path = nested_json_path(conference, stage)
+    if os.path.exists(json_path):
+        sources.append((os.path.getmtime(json_path), None, json_path))
+    directory = shard_dir(conference, stage)
+    manifest = read_manifest(conference, stage)
+    for year, shard in manifest["shards"].items():
+        sources.append((shard["committed_at"], year, os.path.join(directory, shard["file"])))
+    if not sources:
+        raise FileNotFoundError(f"No {stage} data for {conference} at {json_path} or {directory}")
+
+    data = {}
+    shard_years = set()
+    for _, year, path in sorted(sources, key=lambda source: source[0]):
+        if year is None:
+            nested = FileUtils().load_json(path)
+            data.update(nested)
+            shard_years.difference_update(nested)
+        elif stage == "citations":
+            data.update((row["Title"], row["Cited Papers"]) for row in _read_shard(path))
+        else:
+            data[year] = _read_shard(path)
+            shard_years.add(year)
+    for year, pages in manifest.get(CITATION_PAGES, {}).items():
+        if year in shard_years:
+            _apply_citation_pages([data[year]], _read_citation_pages(os.path.join(directory, pages["file"])))
+    return data
+
+
+def export_nested_json(conference, stage, path=None):
+    """Write a stage's output as the nested JSON file, whatever layout it was saved in.
+
+    Returns:
+        Path of the written file
+    """
+    path = path or nested_json_path(conference, stage)
+    FileUtils().save_json(path, load_stage_data(conference, stage))
+    return path
+
+
+OUTPUT_WRITERS = {
+    "json": NestedJsonWriter,
+    "jsonl": JsonlShardWriter,
+}
+
+
+def get_output_writer(conference, stage, output_format=OUTPUT_FORMAT):
+    """Create the writer configured by ``crawler_config.output_format``."""
+    if output_format not in OUTPUT_WRITERS:
+        raise ValueError(f"Invalid output format '{output_format}', expected one of {sorted(OUTPUT_WRITERS)}")
+    return OUTPUT_WRITERS[output_format](conference, stage)
+
+
+def main():
+    """Export sharded output to the nested JSON layout, run from the repository root::
+
+        python -m utils.output_store export -c nsdi -s base
+    """
+    parser = argparse.ArgumentParser(description="Export crawler output to the nested JSON layout")
+    commands = parser.add_subparsers(dest='command', required=True)
+    export = commands.add_parser('export', help='Write <conference>_<stage>_data.json from the saved output')
+    export.add_argument('--conference', '-c', required=True)
+    export.add_argument('--stage', '-s', choices=sorted(STAGE_OUTPUT_DIRS), required=True)
+    export.add_argument('--output', '-o', help='Destination file (default: the stage\'s usual JSON file)')
+    args = parser.parse_args()
+    print(f"\t> Exported {args.stage} data of {args.conference} to "
+          f"{export_nested_json(args.conference, args.stage, args.output)} <")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,86 @@
 import time
 import threading
-from collections import defaultdict
+from config import API_RATE_LIMITS
+
+
+class TokenBucket:
+    """Token bucket with a sustained rate and a burst capacity.
+
+    Callers reserve a token under the lock and sleep outside of it, so one
+    waiting thread never blocks the others from taking their own slot.
+    """
+
+    def __init__(self, interval, burst=1):
+        self.rate = 1.0 / interval
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self):
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def try_acquire(self):
+        """Take a token only if one is available right now."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
 
 
 class RateLimiter:
-    
-    def __init__(self):
-        self._locks = defaultdict(threading.Lock)
-        self._last_call = defaultdict(float)
-    
+
+    def __init__(self, limits=API_RATE_LIMITS):
+        self._buckets = {}
+        self._lock = threading.Lock()
+        for api_name, (interval, burst) in limits.items():
+            self.configure(api_name, interval, burst)
+
+    def configure(self, api_name, interval, burst=1):
+        """Set the sustained rate (seconds per request) and burst for an API."""
+        with self._lock:
+            self._buckets[api_name] = TokenBucket(interval, burst) if interval > 0 else None
+
+    def _get_bucket(self, api_name, interval=0):
+        with self._lock:
+            if api_name not in self._buckets and interval > 0:
+                self._buckets[api_name] = TokenBucket(interval)
+            return self._buckets.get(api_name)
+
+    def reserve(self, api_name, interval=0):
+        """Reserve a slot and return the delay in seconds before it may be used.
+
+        APIs without a configured bucket get one from ``interval``; if that is
+        zero as well the call is not limited.
+        """
+        bucket = self._get_bucket(api_name, interval)
+        return bucket.reserve() if bucket else 0.0
+
+    def acquire(self, api_name, interval=0):
+        delay = self.reserve(api_name, interval)
+        if delay > 0:
+            time.sleep(delay)
+
+    def try_acquire(self, api_name, interval=0):
+        """Non-blocking variant of ``acquire``; returns False if no slot is free."""
+        bucket = self._get_bucket(api_name, interval)
+        return bucket.try_acquire() if bucket else True
+
     def wait_if_needed(self, api_name, delay):
-        with self._locks[api_name]:
-            elapsed = time.time() - self._last_call[api_name]
-            if elapsed < delay:
-                time.sleep(delay - elapsed)
-            self._last_call[api_name] = time.time()
+        self.acquire(api_name, delay)
 
 
 _rate_limiter = RateLimiter()
@@ -22,5 +88,3 @@ _rate_limiter = RateLimiter()
 
 def get_rate_limiter():
     return _rate_limiter
-
-
@@ -1,69 +1,167 @@
 import json
 import hashlib
-import os
-from threading import Lock
+import time
+import logging
+import threading
+from config import (CACHE_BACKEND, CACHE_DIR, CACHE_DB_PATH, MEMORY_CACHE_MAX_ENTRIES, MEMORY_CACHE_MAX_BYTES,
+                    CACHE_TTL, NEGATIVE_CACHE_TTL)
+from utils.cache_backends import CacheEntry, JsonFileCacheBackend, SQLiteCacheBackend, migrate_json_cache
+from utils.memory_cache import BoundedMemoryCache
+
+
+# Metadata entry set once the JSON file cache has been imported into SQLite
+JSON_MIGRATION_DONE = "json_migration_done"
+
+
+def create_cache_backend(backend=CACHE_BACKEND, cache_dir=CACHE_DIR, db_path=CACHE_DB_PATH):
+    """Build the configured cache backend.
+
+    The SQLite backend imports an existing one-file-per-response cache until
+    the database records that the import finished, so an interrupted
+    migration is resumed by the next run.
+    """
+    if backend == 'json':
+        return JsonFileCacheBackend(cache_dir)
+    if backend == 'sqlite':
+        sqlite_backend = SQLiteCacheBackend(db_path)
+        if sqlite_backend.get_metadata(JSON_MIGRATION_DONE) is None:
+            migrated = migrate_json_cache(cache_dir, sqlite_backend)
+            if migrated:
+                logging.info(f"Migrated {migrated} cached responses from {cache_dir} into {db_path}")
+            sqlite_backend.set_metadata(JSON_MIGRATION_DONE, str(time.time()))
+        return sqlite_backend
+    raise ValueError(f"Unknown cache backend: {backend}")
 
 
 class RequestCache:
-    
-    def __init__(self, cache_dir='./cache'):
-        self.cache_dir = cache_dir
-        self.memory_cache = {}
-        self.lock = Lock()
-        os.makedirs(cache_dir, exist_ok=True)
-    
+
+    def __init__(self, backend=None, max_entries=MEMORY_CACHE_MAX_ENTRIES, max_bytes=MEMORY_CACHE_MAX_BYTES,
+                 ttl=CACHE_TTL, negative_ttl=NEGATIVE_CACHE_TTL):
+        self.backend = backend if backend is not None else create_cache_backend()
+        self.memory_cache = BoundedMemoryCache(max_entries, max_bytes)
+        self.ttl = ttl or {}
+        self.negative_ttl = negative_ttl
+
     def _get_cache_key(self, url, params=None):
         key_data = f"{url}:{json.dumps(params, sort_keys=True) if params else ''}"
         return hashlib.md5(key_data.encode()).hexdigest()
-    
-    def _get_cache_path(self, cache_key):
-        return os.path.join(self.cache_dir, f"{cache_key}.json")
-    
-    def get(self, url, params=None):
+
+    def _remember(self, cache_key, entry):
+        self.memory_cache.set(cache_key, entry, len(json.dumps(entry.data)))
+
+    def is_fresh(self, entry, api_name=None):
+        """Whether ``entry`` is still within the TTL policy of ``api_name``.
+
+        APIs without a policy never expire, negative entries always use the
+        short negative TTL.
+        """
+        ttl = self.negative_ttl if entry.is_negative else self.ttl.get(api_name)
+        return ttl is None or entry.age() < ttl
+
+    def lookup(self, url, params=None):
+        """Return the stored CacheEntry for a request regardless of its age."""
         cache_key = self._get_cache_key(url, params)
-        
-        with self.lock:
-            if cache_key in self.memory_cache:
-                return self.memory_cache[cache_key]
-        
-        cache_path = self._get_cache_path(cache_key)
-        if os.path.exists(cache_path):
+
+        entry = self.memory_cache.get(cache_key)
+        if entry is not None:
+            return entry
+
+        try:
+            entry = self.backend.get(cache_key)
+        except Exception as e:
+            logging.debug(f"Cache read failed for {url}: {e}")
+            return None
+        if entry is not None:
+            self._remember(cache_key, entry)
+        return entry
+
+    def get(self, url, params=None, api_name=None):
+        """Return cached data if a fresh, positive entry exists."""
+        entry = self.lookup(url, params)
+        if entry is None or entry.is_negative or not self.is_fresh(entry, api_name):
+            return None
+        return entry.data
+
+    def lookup_many(self, urls, params=None):
+        """Return {url: CacheEntry} for every URL with a stored entry, regardless of age."""
+        keys = {self._get_cache_key(url, params): url for url in urls}
+        entries = {}
+        missing = []
+        for cache_key, url in keys.items():
+            entry = self.memory_cache.get(cache_key)
+            if entry is not None:
+                entries[url] = entry
+            else:
+                missing.append(cache_key)
+        if missing:
             try:
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    with self.lock:
-                        self.memory_cache[cache_key] = data
-                    return data
-            except:
-                pass
-        
-        return None
-    
-    def set(self, url, params, response_data):
+                stored = self.backend.get_many(missing)
+            except Exception as e:
+                logging.debug(f"Cache bulk read failed: {e}")
+                stored = {}
+            for cache_key, entry in stored.items():
+                self._remember(cache_key, entry)
+                entries[keys[cache_key]] = entry
+        return entries
+
+    def get_many(self, urls, params=None, api_name=None):
+        """Look up several URLs sharing the same params. Returns {url: data} for fresh hits."""
+        return {url: entry.data for url, entry in self.lookup_many(urls, params).items()
+                if not entry.is_negative and self.is_fresh(entry, api_name)}
+
+    def set(self, url, params, response_data, etag=None, last_modified=None):
         if response_data is None:
             return
-        
-        cache_key = self._get_cache_key(url, params)
-        
-        with self.lock:
-            self.memory_cache[cache_key] = response_data
-        
-        cache_path = self._get_cache_path(cache_key)
-        try:
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(response_data, f)
-        except:
-            pass
+        self._store({self._get_cache_key(url, params): CacheEntry(response_data, etag=etag,
+                                                                 last_modified=last_modified)})
 
+    def set_many(self, responses, params=None):
+        """Store several {url: data} responses sharing the same params."""
+        self._store({self._get_cache_key(url, params): CacheEntry(data)
+                     for url, data in responses.items() if data is not None})
 
-_request_cache = RequestCache()
+    def set_negative(self, url, params=None, status=404):
+        """Remember that a request failed so it is not retried until the negative TTL ends."""
+        self._store({self._get_cache_key(url, params): CacheEntry(None, status=status)})
 
+    def touch(self, url, params=None):
+        """Restart the TTL of an entry after a successful revalidation (304)."""
+        cache_key = self._get_cache_key(url, params)
+        entry = self.lookup(url, params)
+        if entry is None:
+            return
+        entry.stored_at = time.time()
+        self._remember(cache_key, entry)
+        try:
+            self.backend.touch(cache_key)
+        except Exception as e:
+            logging.debug(f"Cache touch failed for {url}: {e}")
 
-def get_request_cache():
-    return _request_cache
+    def _store(self, items):
+        if not items:
+            return
 
+        for cache_key, entry in items.items():
+            self._remember(cache_key, entry)
 
+        try:
+            self.backend.set_many(items)
+        except Exception as e:
+            logging.debug(f"Cache write failed: {e}")
 
+    def stats(self):
+        """Hit/miss/eviction counters of the in-memory tier."""
+        return self.memory_cache.stats()
 
 
+_request_cache = None
+_request_cache_lock = threading.Lock()
 
+
+def get_request_cache():
+    # Created on first use so importing a client neither opens the database nor starts a migration
+    global _request_cache
+    with _request_cache_lock:
+        if _request_cache is None:
+            _request_cache = RequestCache()
+    return _request_cache
@@ -0,0 +1,134 @@
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Callable, Tuple
+
+
+@dataclass(frozen=True)
+class StageTask:
+    """One step of a job, run by the workers of ``api_name``.
+
+    ``fn`` receives a dict with the results of the tasks listed in
+    ``depends_on`` (None for those that failed) and returns this task's result.
+    """
+    name: str
+    api_name: str
+    fn: Callable
+    depends_on: Tuple[str, ...] = ()
+
+
+class _Job:
+
+    def __init__(self, job_id, tasks, on_complete):
+        self.job_id = job_id
+        self.tasks = {task.name: task for task in tasks}
+        self.on_complete = on_complete
+        self.results = {}
+        self.queued = set()
+
+
+class StageScheduler:
+    """Runs jobs made of dependent tasks on per-API worker pools.
+
+    Each API has its own queue and threads, so a worker waiting on one API's
+    rate limiter never holds back work that is ready for another API. A task
+    is queued as soon as its dependencies are done, and ``on_complete`` is
+    called with every task's result once the whole job has finished.
+    """
+
+    def __init__(self, workers_per_api):
+        self._queues = {api_name: queue.Queue() for api_name in workers_per_api}
+        self._workers = {api_name: max(1, workers) for api_name, workers in workers_per_api.items()}
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._active_jobs = 0
+        self._threads = []
+        for api_name, workers in self._workers.items():
+            for i in range(workers):
+                thread = threading.Thread(target=self._work, args=(api_name,), daemon=True,
+                                          name=f"{api_name}-worker-{i}")
+                thread.start()
+                self._threads.append(thread)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown(wait=exc_type is None)
+
+    def submit(self, job_id, tasks, on_complete):
+        """Schedule a job.
+
+        Args:
+            job_id: Identifier passed back to ``on_complete``
+            tasks: StageTasks of the job; dependencies must be tasks of the same job
+            on_complete: Called as ``on_complete(job_id, results)`` from a worker thread
+        """
+        job = _Job(job_id, tasks, on_complete)
+        for task in tasks:
+            if task.api_name not in self._queues:
+                raise ValueError(f"No workers for API '{task.api_name}'")
+            unknown = set(task.depends_on) - set(job.tasks)
+            if unknown:
+                raise ValueError(f"Task '{task.name}' depends on unknown tasks {sorted(unknown)}")
+        with self._lock:
+            self._active_jobs += 1
+            ready = self._ready_tasks(job)
+        if not job.tasks:
+            self._finish(job)
+        for task in ready:
+            self._queues[task.api_name].put((job, task))
+
+    def join(self):
+        """Block until every submitted job has completed."""
+        with self._idle:
+            while self._active_jobs:
+                self._idle.wait()
+
+    def shutdown(self, wait=True):
+        if wait:
+            self.join()
+        for api_name, workers in self._workers.items():
+            for _ in range(workers):
+                self._queues[api_name].put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _ready_tasks(self, job):
+        # Must hold self._lock
+        ready = [task for name, task in job.tasks.items()
+                 if name not in job.queued and all(dep in job.results for dep in task.depends_on)]
+        job.queued.update(task.name for task in ready)
+        return ready
+
+    def _work(self, api_name):
+        api_queue = self._queues[api_name]
+        while True:
+            item = api_queue.get()
+            if item is None:
+                return
+            job, task = item
+            try:
+                result = task.fn({dep: job.results[dep] for dep in task.depends_on})
+            except Exception as e:
+                logging.error(f"Task '{task.name}' of {job.job_id} failed: {e}")
+                result = None
+            with self._lock:
+                job.results[task.name] = result
+                ready = self._ready_tasks(job)
+                finished = len(job.results) == len(job.tasks)
+            for next_task in ready:
+                self._queues[next_task.api_name].put((job, next_task))
+            if finished:
+                self._finish(job)
+
+    def _finish(self, job):
+        try:
+            job.on_complete(job.job_id, job.results)
+        except Exception as e:
+            logging.error(f"Completion of {job.job_id} failed: {e}")
+        with self._idle:
+            self._active_jobs -= 1
+            self._idle.notify_all()
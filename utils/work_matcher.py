@@ -0,0 +1,50 @@
+import re
+import unicodedata
+from utils.openalex_snapshot import normalize_doi
+
+
+def normalize_title(title):
+    """Lowercase title without accents, punctuation or repeated spaces, for matching across sources."""
+    if not title:
+        return None
+    title = ''.join(c for c in unicodedata.normalize('NFD', title) if unicodedata.category(c) != 'Mn')
+    title = re.sub(r'[^\w\s]', ' ', title.lower())
+    return ' '.join(title.split()) or None
+
+
+class WorkMatcher:
+    """Finds the OpenAlex work of a paper among harvested works, by DOI and then by title.
+
+    A title shared by several works is ambiguous and never matched.
+    """
+
+    def __init__(self, works=()):
+        self.by_doi = {}
+        self.by_title = {}
+        self._ambiguous_titles = set()
+        for work in works:
+            self.add(work)
+
+    def __len__(self):
+        return len(self.by_doi) + len(self.by_title)
+
+    def add(self, work):
+        if not work:
+            return
+        doi = normalize_doi(work.get("doi"))
+        if doi:
+            self.by_doi[doi] = work
+        title = normalize_title(work.get("title"))
+        if title and title not in self._ambiguous_titles:
+            if title in self.by_title and self.by_title[title] is not work:
+                del self.by_title[title]
+                self._ambiguous_titles.add(title)
+            else:
+                self.by_title[title] = work
+
+    def match(self, doi=None, title=None):
+        """Return the work with this DOI or, failing that, this title; None if there is none."""
+        work = self.by_doi.get(normalize_doi(doi)) if doi else None
+        if work is None and title:
+            work = self.by_title.get(normalize_title(title))
+        return work